@@ -27,10 +27,10 @@ import os
 import time
 import logging
 import platform
+import queue
 import shutil
-import requests
-from datetime import datetime
-from collections import deque
+import threading
+import httpx
 from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
@@ -66,18 +66,24 @@ from market_config import MarketConfig
 from binance_api import get_full_analysis, get_price_at_timestamp
 from polymarket_api import (
     create_client, find_current_market, get_balance, CLOB,
+    start_order_ws, stop_order_ws,
 )
 from logger import RadarLogger
 from ws_binance import BinanceWS, HAS_WS
+from ws_polymarket import MarketWS
+from http_client import keep_warm, read_json, session as _session
 from colors import G, R, Y, C, W, B, D, M, BL, X
-from signal_engine import compute_signal, get_market_phase, TP_MAX_PRICE, SL_MIN_PRICE
-from ui_panel import draw_panel, format_scrolling_line, HEADER_LINES
+from signal_engine import PriceHistory, compute_signal, get_market_phase, TP_MAX_PRICE, SL_MIN_PRICE
+from ui_panel import (
+    draw_panel, format_scrolling_line, watch_terminal_size, clock_str, HEADER_LINES,
+    DIRECTION_STYLE, DIRECTION_STYLE_NEUTRAL,
+)
 from trade_executor import (
     handle_buy, execute_close_market, close_all_positions, monitor_tp_sl,
-    sync_positions,
+    prefetch_order_options, sync_positions,
 )
 from input_handler import wait_for_key, sleep_with_key
-from session_stats import print_session_summary
+from session_stats import TradeHistory, print_session_summary
 
 # Configuration
 PRICE_ALERT = float(os.getenv('PRICE_ALERT', '0.80'))
@@ -88,43 +94,195 @@ TRADE_AMOUNT = float(os.getenv('TRADE_AMOUNT', '4'))
 PRICE_BEAT_ALERT = float(os.getenv('PRICE_BEAT_ALERT', '80'))
 HISTORY_MAXLEN = 60
 MARKET_REFRESH_INTERVAL = 60  # seconds between market slug checks
+WS_IDLE_MAX_WAIT = 2  # WS mode: max seconds to wait for new stream data before re-analysing anyway
+# Quote bodies are a few dozen bytes: ask for them uncompressed (no gzip unwrap)
+QUOTE_HEADERS = {"Accept-Encoding": "identity"}
+
+# Exponential backoff by consecutive error count (last entry = cap)
+MARKET_BACKOFF = tuple(min(MARKET_REFRESH_INTERVAL << i, 300) for i in range(4))  # 60, 120, 240, 300
+BINANCE_BACKOFF = tuple(min(1 << i, 30) for i in range(6))  # index 1.. = 2, 4, 8, 16, 30
+
+# Alert output: the bell is sent as part of the alert's first line, so it goes
+# out with that line's flush instead of its own write + flush
+BEEP1, BEEP2, BEEP3 = '\a', '\a\a', '\a\a\a'
+ALERT_RULE = '═' * 55
+
+# draw_panel() placeholders while there is no market data yet (startup, Binance errors)
+PANEL_NO_DATA = {
+    'btc_price': 0, 'bin_direction': '─', 'confidence': 0,
+    'binance_data': {'rsi': 50, 'score': 0}, 'up_buy': 0, 'down_buy': 0,
+}
+
+# Trade-close messages: color codes and fixed text are formatted in once at
+# import; each event only fills in its values with str.format()
+EXIT_COLORS = {'TP': G, 'CANCEL': Y}  # anything else (SL) is red
+EXPIRED_FMT = f"   {Y}  expired {{direction}} {{shares:.0f}}sh @ ${{entry:.2f}} → ${{exit:.2f}} {{pnl_color}}P&L: ${{pnl:+.2f}}{X}"
+CLOSE_PNL_FMT = f"   {{pnl_color}}{B}P&L: ${{pnl:+.2f}} │ Session: ${{session_pnl:+.2f}} ({{trades}} trades){X}"
+CLOSED_STATUS_FMT = f"{G}✓ Closed{X} │ {{pnl_color}}{B}P&L: ${{pnl:+.2f}}{X} {D}({{trades}} trades){X}"
+
+# Startup + donation banner, pre-joined so it goes out in one write
+DONATION_WALLET = "0xa27Bf6B2B26594f8A1BF6Ab50B00Ae0e503d71F6"
+DONATION_URL = f"https://polymarket.com/profile/{DONATION_WALLET}"
+BANNER = "\n".join([
+    "",
+    f"  {C}{B}{'═' * 62}{X}",
+    f"  {C}{B}  POLYMARKET CRYPTO SCALPING RADAR{X}",
+    f"  {C}{'─' * 62}{X}",
+    f"  {W}  Real-time scalping tool for Polymarket updown markets.{X}",
+    f"  {W}  Monitors Binance price + 6 indicators (RSI, MACD, VWAP,{X}",
+    f"  {W}  Bollinger, S/R, ADX) to generate UP/DOWN signals with{X}",
+    f"  {W}  regime detection and phase-aware thresholds.{X}",
+    f"  {D}  Asset: {G}{{asset}}{D} │ Window: {G}{{window}}m{D} │ Trade: {G}${{amount:.0f}}{X}",
+    f"  {C}{'═' * 62}{X}",
+    "",
+    f"  {Y}{B}{'═' * 62}{X}",
+    f"  {Y}{B}  If this tool helps you trade, consider supporting the dev!  {X}",
+    f"  {Y}{B}{'═' * 62}{X}",
+    f"  {D}  Built by a freelance developer in his spare time.{X}",
+    f"  {D}  Any amount helps keep this project alive and improving.{X}",
+    f"  {D}  Thank you for your support!{X}",
+    f"  {Y}{'─' * 62}{X}",
+    f"  {W}Send a tip on Polymarket:{X}",
+    f"  {G}{DONATION_URL}{X}",
+    f"  {Y}{B}{'═' * 62}{X}",
+])
+
+
+# Persistent thread pool (avoid recreating every cycle). Four workers: a close
+# running on the pool submits its own balance/sell calls to it, and the quote
+# fetch may be in flight at the same time.
+_executor = ThreadPoolExecutor(max_workers=4)
+
+# Panel rendering runs on its own thread: the loop hands over a snapshot of
+# draw_panel() kwargs and moves on. One pending frame at most; a newer frame
+# replaces one the renderer has not picked up yet.
+_render_queue = queue.Queue(maxsize=1)
+_render_thread = None
+
+
+def _render_worker():
+    while True:
+        snap = _render_queue.get()
+        if snap is None:
+            return
+        try:
+            draw_panel(**snap)
+        except Exception as e:  # keep the renderer alive on a bad frame
+            logger.debug("Panel render error: %s", e)
+
+
+def _enqueue_render(snap):
+    """Queue a panel frame, dropping the stale one still waiting (if any)."""
+    try:
+        _render_queue.get_nowait()
+    except queue.Empty:
+        pass
+    _render_queue.put_nowait(snap)
+
 
-# Persistent HTTP session (reuses TCP connections via keep-alive)
-_session = requests.Session()
+def _start_renderer():
+    global _render_thread
+    _render_thread = threading.Thread(target=_render_worker, daemon=True)
+    _render_thread.start()
 
-# Persistent thread pool (avoid recreating every cycle)
-_executor = ThreadPoolExecutor(max_workers=2)
+
+def _stop_renderer():
+    """Drop any pending frame and wait for the renderer to exit, so nothing
+    is drawn after the screen is cleared on exit."""
+    global _render_thread
+    if _render_thread is None:
+        return
+    _enqueue_render(None)
+    _render_thread.join(timeout=2)
+    _render_thread = None
 
 
 class PriceCache:
-    """TTL-based cache for get_price() to avoid duplicate HTTP calls."""
+    """TTL-based cache for get_price() to avoid duplicate HTTP calls.
+    Quotes come from the live `feed` (MarketWS) when it has them.
+    Expired entries are revalidated with If-None-Match when the server sent
+    an ETag, so an unchanged price costs a bodiless 304.
+    Ages are integer nanoseconds from time.monotonic_ns()."""
 
-    def __init__(self, ttl_sec=0.5):
-        self._cache = {}
-        self._ttl = ttl_sec
+    def __init__(self, ttl_sec=0.5, feed=None):
+        self._cache = {}  # (token_id, side) -> (price, fetched_at_ns, etag or None)
+        self._ttl_ns = int(ttl_sec * 1_000_000_000)
+        self.feed = feed  # object with get_price(token_id, side) -> float | None
 
     def get(self, token_id: str, side: str) -> float:
-        now = time.time()
-        key = (token_id, side)
-        if key in self._cache:
-            price, ts = self._cache[key]
-            if now - ts < self._ttl:
+        if self.feed:
+            price = self.feed.get_price(token_id, side)
+            if price:
                 return price
+        now = time.monotonic_ns()
+        key = (token_id, side)
+        hit = self._cache.get(key)
+        if hit and now - hit[1] < self._ttl_ns:
+            return hit[0]
         try:
             resp = _session.get(
                 f"{CLOB}/price",
                 params={"token_id": token_id, "side": side},
+                headers=dict(QUOTE_HEADERS, **{"If-None-Match": hit[2]}) if hit and hit[2] else QUOTE_HEADERS,
                 timeout=5,
             )
-            price = float(resp.json()["price"])
-            self._cache[key] = (price, now)  # only cache successful fetches
+            if resp.status_code == 304 and hit:
+                self._cache[key] = (hit[0], now, hit[2])
+                return hit[0]
+            price = float(read_json(resp)["price"])
+            self._cache[key] = (price, now, resp.headers.get("ETag"))  # only cache successful fetches
             return price
-        except (requests.RequestException, KeyError, ValueError) as e:
+        except (httpx.HTTPError, KeyError, ValueError) as e:
             logger.debug("PriceCache fetch error for %s/%s: %s", token_id[:8], side, e)
             return 0.0
 
-    def invalidate(self):
-        self._cache.clear()
+    def get_many(self, pairs) -> list:
+        """Prices for several (token_id, side) pairs in one POST /prices round-trip.
+        Returns prices in the order given (0.0 for failures). Falls back to
+        per-token get() if the batch request fails."""
+        now = time.monotonic_ns()
+        ttl_ns = self._ttl_ns
+        prices = {}
+        misses = []
+        for key in pairs:
+            price = self.feed.get_price(*key) if self.feed else None
+            if price:
+                prices[key] = price
+                continue
+            hit = self._cache.get(key)
+            if hit and now - hit[1] < ttl_ns:
+                prices[key] = hit[0]
+            else:
+                misses.append(key)
+        if misses:
+            try:
+                resp = _session.post(
+                    f"{CLOB}/prices",
+                    json=[{"token_id": token_id, "side": side} for token_id, side in misses],
+                    headers=QUOTE_HEADERS,
+                    timeout=5,
+                )
+                data = read_json(resp)
+                for token_id, side in misses:
+                    price = float(data[token_id][side])
+                    self._cache[(token_id, side)] = (price, now, None)
+                    prices[(token_id, side)] = price
+            except (httpx.HTTPError, KeyError, ValueError, TypeError) as e:
+                logger.debug("PriceCache batch fetch error: %s", e)
+        return [prices[key] if key in prices else self.get(*key) for key in pairs]
+
+    def has_live(self, pairs) -> bool:
+        """True if the feed currently has a quote for every pair (no HTTP needed)."""
+        return bool(self.feed) and all(self.feed.get_price(*key) for key in pairs)
+
+    def invalidate(self, *token_ids):
+        """Drop cached quotes for the given tokens (both sides), or all of them.
+        Called after our own trades, which move the book the cached quote came from."""
+        if not token_ids:
+            self._cache.clear()
+            return
+        for key in [k for k in self._cache if k[0] in token_ids]:
+            self._cache.pop(key, None)
 
 
 _price_cache = PriceCache(ttl_sec=0.5)
@@ -134,9 +292,24 @@ def get_price(token_id, side):
     return _price_cache.get(token_id, side)
 
 
+def _timed(fn, *args):
+    """Run fn(*args) and return (result, elapsed_sec). Used to time pooled calls."""
+    t0 = time.perf_counter()
+    return fn(*args), time.perf_counter() - t0
+
+
 class TradingSession:
     """Encapsulates all mutable state for a trading session."""
 
+    __slots__ = (
+        'market_slug', 'token_up', 'token_down', 'price_to_beat', 'base_time',
+        'positions', 'balance', 'session_pnl', 'trade_count', 'trade_history', 'current_signal',
+        'alert_active', 'alert_side', 'alert_price', 'alert_prices',
+        'status_msg', 'status_clear_at', 'last_action', 'poly_latency_ms',
+        'last_beep', 'last_market_check', 'last_phase',
+        'history', 'binance_errors', 'market_refresh_errors',
+    )
+
     def __init__(self):
         # Market state
         self.market_slug = ""
@@ -150,13 +323,14 @@ class TradingSession:
         self.balance = 0.0
         self.session_pnl = 0.0
         self.trade_count = 0
-        self.trade_history = []
+        self.trade_history = TradeHistory()
         self.current_signal = None
 
         # Alert state
         self.alert_active = False
         self.alert_side = ""
         self.alert_price = 0.0
+        self.alert_prices = None  # (up_buy, down_buy) of the last update_alert()
 
         # UI state
         self.status_msg = ""
@@ -170,7 +344,7 @@ class TradingSession:
         self.last_phase = ""
 
         # Data history
-        self.history = deque(maxlen=HISTORY_MAXLEN)
+        self.history = PriceHistory(HISTORY_MAXLEN)
 
         # Error tracking for exponential backoff
         self.binance_errors = 0
@@ -178,32 +352,50 @@ class TradingSession:
 
     def set_status(self, msg, duration=3):
         self.status_msg = msg
-        self.status_clear_at = time.time() + duration
+        self.status_clear_at = time.monotonic() + duration
 
-    def clear_expired_status(self):
-        if self.status_msg and time.time() >= self.status_clear_at:
+    def clear_expired_status(self, now):
+        if self.status_msg and now >= self.status_clear_at:
             self.status_msg = ""
 
-    def update_alert(self, up_buy, down_buy):
-        if not PRICE_ALERT_ENABLED:
-            return
-        max_price = max(up_buy, down_buy)
-        if max_price >= PRICE_ALERT:
-            if not self.alert_active:
-                self.alert_active = True
-                self.alert_side = "UP" if up_buy >= down_buy else "DOWN"
-                self.alert_price = max_price
-            else:
-                self.alert_price = max_price
-        else:
-            self.alert_active = False
+    def panel_args(self, **kwargs) -> dict:
+        """Keyword arguments for draw_panel(): the session's own fields,
+        updated with the caller's per-cycle values and overrides."""
+        args = {
+            'balance': self.balance, 'market_slug': self.market_slug,
+            'positions': list(self.positions), 'signal': self.current_signal,
+            'alert_active': self.alert_active, 'alert_side': self.alert_side,
+            'alert_price': self.alert_price, 'session_pnl': self.session_pnl,
+            'trade_count': self.trade_count, 'status_msg': self.status_msg,
+            'price_to_beat': self.price_to_beat, 'trade_history': self.trade_history,
+            'last_action': self.last_action, 'poly_latency_ms': self.poly_latency_ms,
+        }
+        args.update(kwargs)
+        return args
+
+    def update_alert(self, up_buy, down_buy, threshold):
+        up_leads = up_buy >= down_buy
+        max_price = up_buy if up_leads else down_buy
+        active = max_price >= threshold
+        # The side is latched when the alert fires and kept while it stays active
+        if not self.alert_active:
+            self.alert_side = ("DOWN", "UP")[up_leads] if active else ""
+        elif not active:
             self.alert_side = ""
-            self.alert_price = 0.0
+        self.alert_active = active
+        self.alert_price = max_price if active else 0.0
 
 
 # --- Main ------------------------------------------------------------------------
 
 def main():
+    # Settings read every cycle, bound as locals (fast lookups in the loop)
+    price_alert = PRICE_ALERT
+    price_alert_enabled = PRICE_ALERT_ENABLED
+    sig_beep = SIGNAL_STRENGTH_BEEP
+    sig_enabled = SIGNAL_ENABLED
+    price_beat_alert = PRICE_BEAT_ALERT
+
     trade_amount = TRADE_AMOUNT
     if len(sys.argv) > 1:
         try:
@@ -220,8 +412,8 @@ def main():
 
     # -- Logger --
     radar_logger = RadarLogger()
-    session_start = time.time()
-    session_start_str = datetime.now().strftime("%H:%M:%S")
+    session_start = time.monotonic()
+    session_start_str = time.strftime("%H:%M:%S")
 
     # -- Session state --
     session = TradingSession()
@@ -229,29 +421,7 @@ def main():
     # -- Clear screen and donation banner --
     sys.stdout.write("\033[2J\033[H")
     sys.stdout.flush()
-    DONATION_WALLET = "0xa27Bf6B2B26594f8A1BF6Ab50B00Ae0e503d71F6"
-    print()
-    print(f"  {C}{B}{'═' * 62}{X}")
-    print(f"  {C}{B}  POLYMARKET CRYPTO SCALPING RADAR{X}")
-    print(f"  {C}{'─' * 62}{X}")
-    print(f"  {W}  Real-time scalping tool for Polymarket updown markets.{X}")
-    print(f"  {W}  Monitors Binance price + 6 indicators (RSI, MACD, VWAP,{X}")
-    print(f"  {W}  Bollinger, S/R, ADX) to generate UP/DOWN signals with{X}")
-    print(f"  {W}  regime detection and phase-aware thresholds.{X}")
-    print(f"  {D}  Asset: {G}{config.display_name}{D} │ Window: {G}{config.window_min}m{D} │ Trade: {G}${trade_amount:.0f}{X}")
-    print(f"  {C}{'═' * 62}{X}")
-    print()
-    print(f"  {Y}{B}{'═' * 62}{X}")
-    print(f"  {Y}{B}  If this tool helps you trade, consider supporting the dev!  {X}")
-    print(f"  {Y}{B}{'═' * 62}{X}")
-    print(f"  {D}  Built by a freelance developer in his spare time.{X}")
-    print(f"  {D}  Any amount helps keep this project alive and improving.{X}")
-    print(f"  {D}  Thank you for your support!{X}")
-    print(f"  {Y}{'─' * 62}{X}")
-    DONATION_URL = f"https://polymarket.com/profile/{DONATION_WALLET}"
-    print(f"  {W}Send a tip on Polymarket:{X}")
-    print(f"  {G}{DONATION_URL}{X}")
-    print(f"  {Y}{B}{'═' * 62}{X}")
+    print(BANNER.format(asset=config.display_name, window=config.window_min, amount=trade_amount))
     for i in range(20, 0, -1):
         print(f"\r  {D}Starting in {i}s...{X}", end="", flush=True)
         time.sleep(1)
@@ -270,6 +440,9 @@ def main():
         print(f" {R}✗{X} {e}")
         return
 
+    # Order status push feed (monitor_order falls back to polling without it)
+    start_order_ws(client)
+
     print(f"   Finding {config.display_name} {config.window_min}m market...", end="", flush=True)
     try:
         event, market, session.token_up, session.token_down, time_remaining = find_current_market(config)
@@ -281,11 +454,11 @@ def main():
 
     # Get Price to Beat (asset price at window start)
     try:
-        window_ts = int(session.market_slug.split('-')[-1])
+        window_ts = int(session.market_slug.rpartition('-')[2])
         session.price_to_beat = get_price_at_timestamp(window_ts, symbol=config.binance_symbol)
         if session.price_to_beat > 0:
             print(f"   Price to Beat: {G}${session.price_to_beat:,.2f}{X}")
-    except (ValueError, IndexError, requests.RequestException) as e:
+    except (ValueError, IndexError, httpx.HTTPError) as e:
         logger.debug("Price to beat fetch error: %s", e)
 
     # Sync existing positions (bought directly on Polymarket platform)
@@ -300,6 +473,12 @@ def main():
     else:
         print(f" {D}─{X} No existing positions")
 
+    # Live Polymarket quotes (PriceCache falls back to HTTP while it has none)
+    market_ws = MarketWS([session.token_up, session.token_down])
+    if market_ws.start():
+        _price_cache.feed = market_ws
+    prefetch_order_options(client, _executor, session.token_up, session.token_down)
+
     # Start Binance WebSocket
     binance_ws = BinanceWS(symbol=config.ws_symbol)
     print(f"   Connecting to Binance WS...", end="", flush=True)
@@ -339,69 +518,133 @@ def main():
         # Position cursor at start of scroll region
         sys.stdout.write(f"\033[{HEADER_LINES + 1};1H")
         sys.stdout.flush()
+        watch_terminal_size()  # the panel width is re-read only on resize
+        # Quotes usually come from the market WS, so keep the CLOB connection
+        # warm for the HTTP fallback and the exit quotes of TP/SL and closes
+        keep_warm(f"{CLOB}/time")
 
-        session.last_market_check = time.time()
+        session.last_market_check = time.monotonic()
         session.base_time = time_remaining
 
         # Draw initial panel
-        now_str = datetime.now().strftime("%H:%M:%S")
-        draw_panel(now_str, session.balance, 0, '─', 0, {'rsi': 50, 'score': 0},
-                   session.market_slug, time_remaining, 0, 0, session.positions, None, trade_amount,
-                   session_pnl=session.session_pnl, trade_count=session.trade_count,
-                   price_to_beat=session.price_to_beat, trade_history=session.trade_history,
-                   last_action=session.last_action, asset_name=config.display_name)
+        _start_renderer()
+        now_str = clock_str()
+        _enqueue_render(session.panel_args(
+            **PANEL_NO_DATA, time_str=now_str, time_remaining=time_remaining,
+            trade_amount=trade_amount, asset_name=config.display_name))
 
         print(f"   {D}Collecting initial data...{X}")
 
+        # Bound once for the loop: the session keeps these objects for its whole
+        # life (only their contents change), so locals skip the attribute lookups
+        asset_name = config.display_name
+        positions = session.positions
+        history = session.history
+
+        # -- Hotkeys (read during the cycle's sleep); `panel` is the current cycle's --
+        def manual_buy(key):
+            """U/D: market buy in that direction, then redraw."""
+            _, session.balance, session.last_action = handle_buy(
+                client, 'up' if key == 'u' else 'down', trade_amount,
+                session.token_up, session.token_down, positions, session.balance,
+                radar_logger, session.session_pnl, get_price, _executor, reason="manual")
+            _price_cache.invalidate(session.token_up if key == 'u' else session.token_down)
+            _enqueue_render(session.panel_args(**panel, ws_status=binance_ws.status))
+
+        def emergency_close(key):
+            """C: sell everything on the platform and book the tracked positions."""
+            # Show closing status in static panel
+            session.set_status(f"{Y}{B}EMERGENCY CLOSE...{X}", duration=5)
+            session.last_action = ('emergency',)
+            _enqueue_render(session.panel_args(**panel, ws_status=binance_ws.status))
+            # Sell on the pool; book the tracked positions meanwhile, at fresh quotes
+            _price_cache.invalidate(session.token_up, session.token_down)
+            fut_close = _executor.submit(execute_close_market, client, session.token_up,
+                                         session.token_down, get_price, _executor)
+            if positions:
+                total_pnl, cnt, session.session_pnl, _, proceeds = close_all_positions(
+                    positions, session.token_up, session.token_down,
+                    radar_logger, "emergency",
+                    session.session_pnl, session.trade_history, get_price, _executor,
+                    feed=_price_cache.feed)
+                session.trade_count += cnt
+                session.balance += proceeds
+            fut_close.result()  # report "Closed" only once the sells are done
+            # Show result in static panel
+            pnl_color = G if session.session_pnl >= 0 else R
+            session.set_status(
+                CLOSED_STATUS_FMT.format(pnl_color=pnl_color, pnl=session.session_pnl,
+                                         trades=session.trade_count),
+                duration=5)
+            session.last_action = ('closed', pnl_color, session.session_pnl)
+            _enqueue_render(session.panel_args(**panel, ws_status=binance_ws.status))
+
+        def quit_radar(key):
+            raise KeyboardInterrupt
+
+        hotkeys = {'u': manual_buy, 'd': manual_buy, 'c': emergency_close, 'q': quit_radar}
+
         while True:
             try:
+                # One reading of each clock per cycle, reused below: wall time for
+                # the clock string and history, monotonic for every interval
+                # (beep cooldowns, market refresh, status expiry)
                 now = time.time()
+                tick = time.monotonic()
+                now_str = clock_str(now)
 
                 # Auto-clear status message
-                session.clear_expired_status()
+                session.clear_expired_status(tick)
 
                 # Refresh market (with exponential backoff on errors)
-                refresh_interval = min(
-                    MARKET_REFRESH_INTERVAL * (2 ** session.market_refresh_errors),
-                    300,
-                )
-                if now - session.last_market_check > refresh_interval:
+                refresh_interval = MARKET_BACKOFF[min(session.market_refresh_errors, len(MARKET_BACKOFF) - 1)]
+                if tick - session.last_market_check > refresh_interval:
                     try:
                         event, market, new_token_up, new_token_down, time_remaining = find_current_market(config)
                         new_slug = event.get("slug", "")
                         session.market_refresh_errors = 0  # reset on success
+                        fut_ptb = None
                         # Detect market transition (new window)
                         if new_slug != session.market_slug:
-                            if session.positions:
-                                print(f"   {Y}{B}MARKET CHANGED → {new_slug} — clearing {len(session.positions)} old position(s){X}")
-                                total_pnl, cnt, session.session_pnl, pnl_list = close_all_positions(
-                                    session.positions, session.token_up, session.token_down,
+                            if positions:
+                                print(f"   {Y}{B}MARKET CHANGED → {new_slug} — clearing {len(positions)} old position(s){X}")
+                                total_pnl, cnt, session.session_pnl, pnl_list, _ = close_all_positions(
+                                    positions, session.token_up, session.token_down,
                                     radar_logger, "market_expired",
-                                    session.session_pnl, session.trade_history, get_price)
+                                    session.session_pnl, session.trade_history, get_price, _executor,
+                                    feed=_price_cache.feed)
                                 session.trade_count += cnt
                                 for d, sh, ep, xp, pnl in pnl_list:
                                     pnl_color = G if pnl >= 0 else R
-                                    print(f"   {Y}  expired {d.upper()} {sh:.0f}sh @ ${ep:.2f} → ${xp:.2f} {pnl_color}P&L: {'+' if pnl >= 0 else ''}${pnl:.2f}{X}")
-                            session.history.clear()
-                            # Fetch new Price to Beat
-                            try:
-                                window_ts = int(new_slug.split('-')[-1])
-                                session.price_to_beat = get_price_at_timestamp(window_ts, symbol=config.binance_symbol)
-                            except (ValueError, IndexError, requests.RequestException) as e:
-                                logger.debug("Price to beat fetch error on market switch: %s", e)
-                                session.price_to_beat = 0.0
+                                    print(EXPIRED_FMT.format(direction=d.upper(), shares=sh, entry=ep, exit=xp,
+                                                             pnl_color=pnl_color, pnl=pnl))
+                            history.clear()
+                            session.price_to_beat = 0.0
                             session.set_status(f"{Y}MARKET SWITCHED → {new_slug}{X}", duration=5)
+                        # Fetch the Price to Beat on the pool for a new window, or
+                        # retry it if the last fetch failed (the candle may not have
+                        # existed yet); it overlaps the position/balance sync below
+                        # and is collected after it
+                        if session.price_to_beat <= 0:
+                            try:
+                                window_ts = int(new_slug.rpartition('-')[2])
+                                fut_ptb = _executor.submit(get_price_at_timestamp, window_ts,
+                                                           symbol=config.binance_symbol)
+                            except (ValueError, IndexError) as e:
+                                logger.debug("Price to beat fetch error on market refresh: %s", e)
                         session.market_slug = new_slug
                         session.token_up = new_token_up
                         session.token_down = new_token_down
+                        market_ws.resubscribe([new_token_up, new_token_down])
+                        prefetch_order_options(client, _executor, new_token_up, new_token_down)
                         session.base_time = time_remaining
-                        session.last_market_check = now
+                        session.last_market_check = tick
 
                         # Sync positions with platform (detect buys/sells made outside the radar)
                         try:
                             changes = sync_positions(
                                 client, session.token_up, session.token_down,
-                                session.positions, get_price)
+                                positions, get_price)
                             if changes:
                                 for direction, shares, price, action in changes:
                                     d_color = G if direction == 'up' else R
@@ -418,24 +661,41 @@ def main():
                         except Exception as e:
                             logger.debug("Balance sync error: %s", e)
 
-                    except (requests.RequestException, KeyError, ValueError) as e:
+                        if fut_ptb is not None:
+                            # get_price_at_timestamp() returns 0.0 on fetch errors
+                            session.price_to_beat = fut_ptb.result()
+
+                    except (httpx.HTTPError, KeyError, ValueError) as e:
                         session.market_refresh_errors += 1
                         logger.debug("Market refresh error (attempt %d): %s",
                                      session.market_refresh_errors, e)
-                        session.last_market_check = now
+                        session.last_market_check = tick
 
                 # Calculate decreasing time remaining
-                elapsed = (now - session.last_market_check) / 60
+                elapsed = (tick - session.last_market_check) / 60
                 current_time = max(0, session.base_time - elapsed)
 
+                # Per-cycle draw_panel() values, filled in as the data arrives;
+                # session fields are read at each redraw (panel_args)
+                panel = {'time_str': now_str, 'time_remaining': current_time,
+                         'trade_amount': trade_amount, 'asset_name': asset_name}
+
                 # Auto-recover WS if not running
                 if not binance_ws._running and HAS_WS:
                     binance_ws.start()
 
+                # Polymarket quotes are independent of the Binance analysis: if they
+                # need HTTP, start them now so the round-trip overlaps it; with the
+                # market WS feed live they are in-memory lookups and skip the pool
+                quote_pairs = ((session.token_up, "BUY"), (session.token_down, "BUY"))
+                fut_prices = None
+                if not _price_cache.has_live(quote_pairs):
+                    fut_prices = _executor.submit(_timed, _price_cache.get_many, quote_pairs)
+
                 # Collect data (WS candles if available, else HTTP)
                 try:
                     ws_candles, data_source = binance_ws.get_candles(limit=20)
-                    if ws_candles and len(ws_candles) >= 5:
+                    if len(ws_candles) >= 5:
                         bin_direction, confidence, details = get_full_analysis(candles=ws_candles, symbol=config.binance_symbol)
                     else:
                         bin_direction, confidence, details = get_full_analysis(symbol=config.binance_symbol)
@@ -454,41 +714,32 @@ def main():
                     }
                     current_regime = details.get('regime', 'RANGE')
                     session.binance_errors = 0  # reset on success
+                    panel.update(btc_price=btc_price, bin_direction=bin_direction,
+                                 confidence=confidence, binance_data=binance_data,
+                                 regime=current_regime, data_source=data_source)
                 except Exception as e:
                     session.binance_errors += 1
-                    delay = min(2 * (2 ** (session.binance_errors - 1)), 30)
-                    now_str = datetime.now().strftime("%H:%M:%S")
+                    delay = BINANCE_BACKOFF[min(session.binance_errors, len(BINANCE_BACKOFF) - 1)]
                     print(f"   {D}{now_str}{X} │ {Y}Binance error (retry {session.binance_errors}, wait {delay:.0f}s): {e}{X}")
-                    draw_panel(now_str, session.balance, 0, '─', 0, {'rsi': 50, 'score': 0},
-                               session.market_slug, current_time, 0, 0, session.positions, None, trade_amount,
-                               session_pnl=session.session_pnl, trade_count=session.trade_count,
-                               status_msg=f"{Y}Binance error — retrying in {delay:.0f}s...{X}",
-                               price_to_beat=session.price_to_beat, trade_history=session.trade_history,
-                               last_action=session.last_action, asset_name=config.display_name)
+                    _enqueue_render(session.panel_args(
+                        **panel, **PANEL_NO_DATA, signal=None, alert_active=False, poly_latency_ms=0,
+                        status_msg=f"{Y}Binance error — retrying in {delay:.0f}s...{X}"))
                     key = sleep_with_key(delay)
                     if key == 'q':
                         raise KeyboardInterrupt
                     continue
 
-                _poly_t0 = time.time()
-                fut_up = _executor.submit(get_price, session.token_up, "BUY")
-                fut_dn = _executor.submit(get_price, session.token_down, "BUY")
-                up_buy = fut_up.result()
-                down_buy = fut_dn.result()
-                session.poly_latency_ms = (time.time() - _poly_t0) * 1000
+                if fut_prices is None:
+                    (up_buy, down_buy), poly_sec = _timed(_price_cache.get_many, quote_pairs)
+                else:
+                    (up_buy, down_buy), poly_sec = fut_prices.result()
+                session.poly_latency_ms = poly_sec * 1000
+                panel['up_buy'], panel['down_buy'] = up_buy, down_buy
                 if up_buy <= 0:
-                    now_str = datetime.now().strftime("%H:%M:%S")
                     print(f"   {Y}Token price unavailable (UP=${up_buy:.2f} DN=${down_buy:.2f}) — retrying...{X}")
-                    draw_panel(now_str, session.balance, btc_price, bin_direction, confidence,
-                               binance_data, session.market_slug, current_time, up_buy,
-                               down_buy, session.positions, None, trade_amount,
-                               session_pnl=session.session_pnl, trade_count=session.trade_count,
-                               regime=current_regime, data_source=data_source,
-                               status_msg=f"{Y}Token prices unavailable — retrying...{X}",
-                               ws_status=binance_ws.status,
-                               price_to_beat=session.price_to_beat, trade_history=session.trade_history,
-                               last_action=session.last_action, asset_name=config.display_name,
-                               poly_latency_ms=session.poly_latency_ms)
+                    _enqueue_render(session.panel_args(
+                        **panel, signal=None, alert_active=False, ws_status=binance_ws.status,
+                        status_msg=f"{Y}Token prices unavailable — retrying...{X}"))
                     key = sleep_with_key(2)
                     if key == 'q':
                         raise KeyboardInterrupt
@@ -500,56 +751,44 @@ def main():
                 session.last_phase = current_phase
 
                 # Update history for signal computation
-                session.history.append({
-                    'ts': time.time(), 'up': up_buy, 'down': down_buy, 'btc': btc_price,
-                })
+                history.append(now, up_buy, down_buy, btc_price)
 
                 # Compute signal (regime + phase aware)
-                session.current_signal = compute_signal(
+                signal = session.current_signal = compute_signal(
                     up_buy, down_buy, btc_price, binance_data,
-                    session.history, regime=current_regime, phase=current_phase)
-                if not session.current_signal:
+                    history, regime=current_regime, phase=current_phase)
+                if not signal:
                     key = sleep_with_key(2)
                     if key == 'q':
                         raise KeyboardInterrupt
                     continue
 
                 # Log signal snapshot
-                radar_logger.log_signal(btc_price, up_buy, down_buy, session.current_signal,
+                radar_logger.log_signal(btc_price, up_buy, down_buy, signal,
                                         binance_data, regime=current_regime, phase=current_phase)
 
-                now_str = datetime.now().strftime("%H:%M:%S")
-
                 # -- UPDATE STATIC PANEL --
-                draw_panel(now_str, session.balance, btc_price, bin_direction, confidence,
-                           binance_data, session.market_slug, current_time, up_buy,
-                           down_buy, session.positions, session.current_signal, trade_amount,
-                           session.alert_active, session.alert_side, session.alert_price,
-                           session.session_pnl, session.trade_count,
-                           regime=current_regime, phase=current_phase,
-                           data_source=data_source, status_msg=session.status_msg,
-                           ws_status=binance_ws.status,
-                           price_to_beat=session.price_to_beat, trade_history=session.trade_history,
-                           last_action=session.last_action, asset_name=config.display_name,
-                           poly_latency_ms=session.poly_latency_ms)
+                panel['phase'] = current_phase
+                _enqueue_render(session.panel_args(**panel, ws_status=binance_ws.status))
 
                 # -- SCROLLING LOG --
-                s_dir = session.current_signal['direction']
-                strength = session.current_signal['strength']
-                sug = session.current_signal.get('suggestion')
-                trend = session.current_signal.get('trend', 0)
-                sr_raw = session.current_signal.get('sr_raw', 0)
-                sr_adj = session.current_signal.get('sr_adj', 0)
-                if s_dir == 'UP': color, sym = G, '▲'
-                elif s_dir == 'DOWN': color, sym = R, '▼'
-                else: color, sym = D, '─'
-
-                print(format_scrolling_line(now_str, btc_price, up_buy, down_buy,
-                                            session.current_signal, session.positions,
-                                            current_regime, asset_name=config.display_name))
+                s_dir = signal['direction']
+                strength = signal['strength']
+                sug = signal.get('suggestion')
+                trend = signal.get('trend', 0)
+                sr_raw = signal.get('sr_raw', 0)
+                sr_adj = signal.get('sr_adj', 0)
+                color, sym = DIRECTION_STYLE.get(s_dir, DIRECTION_STYLE_NEUTRAL)
+
+                # The scrolling line and this cycle's alerts are collected and
+                # written together (one write + flush) before anything that
+                # waits for a key
+                out = [format_scrolling_line(now_str, btc_price, up_buy, down_buy,
+                                             signal, positions,
+                                             current_regime, asset_name=asset_name)]
 
                 # --- MEAN REVERSION ALERT (MID + RSI extreme + BB touch + token cheap) ---
-                if current_phase == 'MID' and (now - session.last_beep) > 30:
+                if current_phase == 'MID' and (tick - session.last_beep) > 30:
                     rsi = binance_data.get('rsi', 50)
                     bb = binance_data.get('bb_pos', 0.5)
                     mr_direction = None
@@ -561,58 +800,59 @@ def main():
                     if mr_direction:
                         token_price = up_buy if mr_direction == 'UP' else down_buy
                         if token_price < 0.70:
-                            sys.stdout.write('\a\a\a')
-                            sys.stdout.flush()
                             mr_color = G if mr_direction == 'UP' else R
-                            print(f"   {mr_color}{B}{'═' * 55}{X}")
-                            print(f"   {mr_color}{B}  MEAN REVERSION → {mr_direction} │ RSI={rsi:.0f} BB={bb:.2f} │ ${token_price:.2f}{X}")
-                            print(f"   {W}  Token cheap + RSI extreme + Bollinger touch{X}")
-                            print(f"   {W}  Press {mr_color}{B}{mr_direction[0]}{X}{W} to buy or wait...{X}")
-                            print(f"   {mr_color}{B}{'═' * 55}{X}")
-                            session.last_beep = now
+                            rule = f"   {mr_color}{B}{ALERT_RULE}{X}"
+                            out.append(f"{BEEP3}{rule}\n"
+                                       f"   {mr_color}{B}  MEAN REVERSION → {mr_direction} │ RSI={rsi:.0f} BB={bb:.2f} │ ${token_price:.2f}{X}\n"
+                                       f"   {W}  Token cheap + RSI extreme + Bollinger touch{X}\n"
+                                       f"   {W}  Press {mr_color}{B}{mr_direction[0]}{X}{W} to buy or wait...{X}\n"
+                                       f"{rule}")
+                            session.last_beep = tick
 
                 # --- PRICE TO BEAT ALERT (MID phase + token still cheap) ---
-                elif current_phase == 'MID' and session.price_to_beat > 0 and PRICE_BEAT_ALERT > 0:
+                elif current_phase == 'MID' and session.price_to_beat > 0 and price_beat_alert > 0:
                     price_diff = btc_price - session.price_to_beat
                     token_price = up_buy if price_diff > 0 else down_buy
-                    if abs(price_diff) >= PRICE_BEAT_ALERT and token_price < 0.70 and (now - session.last_beep) > 30:
+                    if abs(price_diff) >= price_beat_alert and token_price < 0.70 and (tick - session.last_beep) > 30:
                         beat_dir = 'UP' if price_diff > 0 else 'DOWN'
                         beat_color = G if beat_dir == 'UP' else R
-                        print(f"   {beat_color}{B}  PRICE BEAT → {beat_dir} │ BTC ${abs(price_diff):.0f} from PTB │ ${token_price:.2f}{X}")
-                        session.last_beep = now
+                        out.append(f"   {beat_color}{B}  PRICE BEAT → {beat_dir} │ BTC ${abs(price_diff):.0f} from PTB │ ${token_price:.2f}{X}")
+                        session.last_beep = tick
 
                 # --- POSITION MONITOR (TP/SL alert for open positions) ---
-                if session.positions:
-                    for pos in session.positions:
+                # One alert per 15s at most, so the cooldown is checked once up
+                # front and the scan stops at the first hit
+                if positions and (tick - session.last_beep) > 15:
+                    for pos in positions:
                         cur_price = up_buy if pos['direction'] == 'up' else down_buy
                         entry = pos['price']
-                        pnl_pct = (cur_price - entry) / entry if entry > 0 else 0
-                        tp_target = min(entry + 0.20, 0.55)
-                        sl_target = max(entry - 0.15, 0.05)
-                        d_color = G if pos['direction'] == 'up' else R
-                        if cur_price >= tp_target and (now - session.last_beep) > 15:
-                            sys.stdout.write('\a\a')
-                            sys.stdout.flush()
-                            print(f"   {G}{B}  TP HIT │ {pos['direction'].upper()} ${entry:.2f} → ${cur_price:.2f} (+{pnl_pct:+.0%}) │ Press C to close{X}")
-                            session.last_beep = now
-                        elif cur_price <= sl_target and (now - session.last_beep) > 15:
-                            sys.stdout.write('\a')
-                            sys.stdout.flush()
-                            print(f"   {R}{B}  SL HIT │ {pos['direction'].upper()} ${entry:.2f} → ${cur_price:.2f} ({pnl_pct:+.0%}) │ Press C to close{X}")
-                            session.last_beep = now
+                        if cur_price >= min(entry + 0.20, 0.55):
+                            pnl_pct = (cur_price - entry) / entry if entry > 0 else 0
+                            out.append(f"{BEEP2}   {G}{B}  TP HIT │ {pos['direction'].upper()} ${entry:.2f} → ${cur_price:.2f} (+{pnl_pct:+.0%}) │ Press C to close{X}")
+                            session.last_beep = tick
+                            break
+                        if cur_price <= max(entry - 0.15, 0.05):
+                            pnl_pct = (cur_price - entry) / entry if entry > 0 else 0
+                            out.append(f"{BEEP1}   {R}{B}  SL HIT │ {pos['direction'].upper()} ${entry:.2f} → ${cur_price:.2f} ({pnl_pct:+.0%}) │ Press C to close{X}")
+                            session.last_beep = tick
+                            break
+
+                # One write for the cycle's lines: stdout is line-buffered, so this
+                # is a single flush (print() writes the text and the "\n" separately)
+                sys.stdout.write("\n".join(out) + "\n")
 
                 # --- OPPORTUNITY DETECTED ---
                 # Use phase-dependent threshold (CLOSING phase = 999, blocks all)
-                effective_threshold = max(SIGNAL_STRENGTH_BEEP, phase_threshold)
-                if SIGNAL_ENABLED and strength >= effective_threshold and s_dir != 'NEUTRAL' and sug:
+                effective_threshold = max(sig_beep, phase_threshold)
+                if sig_enabled and strength >= effective_threshold and s_dir != 'NEUTRAL' and sug:
                     phase_info = f" │ Phase: {current_phase}" if current_phase != 'MID' else ""
                     regime_info = f" │ Regime: {current_regime}" if current_regime != 'RANGE' else ""
-                    print()
-                    print(f"   {color}{B}{'═' * 55}{X}")
-                    print(f"   {color}{B}OPPORTUNITY! {sym} {s_dir} {strength}%{X}")
-                    print(f"   {W}   Entry: ${sug['entry']:.2f} → TP: ${sug['tp']:.2f} (+${sug['tp'] - sug['entry']:.2f}) / SL: ${sug['sl']:.2f} (-${sug['entry'] - sug['sl']:.2f}){X}")
-                    print(f"   {W}   Amount: ${trade_amount:.0f} │ Trend: {trend:+.2f} │ SR: {sr_raw:+.1f}→{sr_adj:+.1f}{regime_info}{phase_info}{X}")
-                    print(f"   {color}{B}{'═' * 55}{X}")
+                    rule = f"   {color}{B}{ALERT_RULE}{X}"
+                    print(f"\n{rule}\n"
+                          f"   {color}{B}OPPORTUNITY! {sym} {s_dir} {strength}%{X}\n"
+                          f"   {W}   Entry: ${sug['entry']:.2f} → TP: ${sug['tp']:.2f} (+${sug['tp'] - sug['entry']:.2f}) / SL: ${sug['sl']:.2f} (-${sug['entry'] - sug['sl']:.2f}){X}\n"
+                          f"   {W}   Amount: ${trade_amount:.0f} │ Trend: {trend:+.2f} │ SR: {sr_raw:+.1f}→{sr_adj:+.1f}{regime_info}{phase_info}{X}\n"
+                          f"{rule}")
 
                     key = wait_for_key(timeout_sec=10)
 
@@ -620,8 +860,9 @@ def main():
                         trade_dir = 'up' if s_dir == 'UP' else 'down'
                         info, session.balance, session.last_action = handle_buy(
                             client, trade_dir, trade_amount, session.token_up, session.token_down,
-                            session.positions, session.balance, radar_logger,
+                            positions, session.balance, radar_logger,
                             session.session_pnl, get_price, _executor, reason="signal")
+                        _price_cache.invalidate(session.token_up if trade_dir == 'up' else session.token_down)
                         if info:
                             real_entry = info['price']
                             tp = min(real_entry + (sug['tp'] - sug['entry']), TP_MAX_PRICE)
@@ -634,148 +875,83 @@ def main():
                             print()
                             reason, exit_price = monitor_tp_sl(
                                 token_id, tp, sl, tp_above, sl_above,
-                                get_price, _executor)
+                                get_price, _executor, feed=_price_cache.feed)
 
                             print()
-                            if reason == 'TP':
-                                exit_color = G
-                            elif reason == 'CANCEL':
-                                exit_color = Y
-                            else:
-                                exit_color = R
+                            exit_color = EXIT_COLORS.get(reason, R)
                             print(f"   {exit_color}{B}⚡ {reason} @ ${exit_price:.2f}! Closing...{X}")
-                            close_msg = execute_close_market(
-                                client, session.token_up, session.token_down,
+                            # The sell runs on the pool while the close is booked locally
+                            fut_close = _executor.submit(
+                                execute_close_market, client, session.token_up, session.token_down,
                                 get_price, _executor)
-                            print(f"   {close_msg}")
-                            pnl = (exit_price - real_entry) * info['shares']
+                            shares = info['shares']
+                            notional = shares * exit_price
+                            pnl = (exit_price - real_entry) * shares
                             session.session_pnl += pnl
                             session.trade_count += 1
                             session.trade_history.append(pnl)
-                            radar_logger.log_trade("CLOSE", trade_dir, info['shares'], exit_price,
-                                                   info['shares'] * exit_price, reason.lower(),
+                            radar_logger.log_trade("CLOSE", trade_dir, shares, exit_price,
+                                                   notional, reason.lower(),
                                                    pnl, session.session_pnl)
+                            print(f"   {fut_close.result()}")
                             pnl_color = G if pnl >= 0 else R
-                            session.last_action = f"{exit_color}{B}{reason}{X} @ ${exit_price:.2f} │ {pnl_color}P&L: {'+' if pnl >= 0 else ''}${pnl:.2f}{X}"
-                            print(f"   {pnl_color}{B}P&L: {'+' if pnl >= 0 else ''}${pnl:.2f} │ Session: {'+' if session.session_pnl >= 0 else ''}${session.session_pnl:.2f} ({session.trade_count} trades){X}")
-                            session.balance += exit_price * info['shares']
-                            session.positions.clear()
+                            session.last_action = ('close', exit_color, reason, exit_price, pnl_color, pnl)
+                            print(CLOSE_PNL_FMT.format(
+                                pnl_color=pnl_color, pnl=pnl,
+                                session_pnl=session.session_pnl, trades=session.trade_count))
+                            session.balance += notional
+                            positions.clear()
                             print(f"   {D}Returning to radar...{X}")
                             print()
-                        else:
-                            session.last_action = f"{R}✗ BUY {trade_dir.upper()} FAILED{X}"
+                        # (a failed buy is already recorded in last_action by handle_buy)
 
-                        session.last_beep = time.time()
+                        session.last_beep = time.monotonic()
                     elif key in ('u', 'd'):
-                        manual_dir = 'up' if key == 'u' else 'down'
-                        info, session.balance, session.last_action = handle_buy(
-                            client, manual_dir, trade_amount, session.token_up, session.token_down,
-                            session.positions, session.balance, radar_logger,
-                            session.session_pnl, get_price, _executor, reason="manual")
-                        draw_panel(now_str, session.balance, btc_price, bin_direction, confidence,
-                                   binance_data, session.market_slug, current_time, up_buy,
-                                   down_buy, session.positions, session.current_signal, trade_amount,
-                                   session.alert_active, session.alert_side, session.alert_price,
-                                   session.session_pnl, session.trade_count,
-                                   regime=current_regime, phase=current_phase,
-                                   data_source=data_source, ws_status=binance_ws.status,
-                                   price_to_beat=session.price_to_beat,
-                                   trade_history=session.trade_history,
-                                   last_action=session.last_action, asset_name=config.display_name,
-                                   poly_latency_ms=session.poly_latency_ms)
+                        manual_buy(key)
                     else:
                         print(f"   {D}Ignored.{X}")
                         print()
-                        session.last_beep = time.time()
+                        session.last_beep = time.monotonic()
 
                 # Price alert
-                session.update_alert(up_buy, down_buy)
+                # (same prices as last time → same alert state, nothing to update)
+                if price_alert_enabled and (up_buy, down_buy) != session.alert_prices:
+                    session.alert_prices = (up_buy, down_buy)
+                    session.update_alert(up_buy, down_buy, price_alert)
 
                 # --- CHECK HOTKEYS DURING SLEEP ---
+                # Waits end at fixed offsets from the cycle start (tick), so the
+                # period does not stretch by however long the cycle took
                 cycle_time = 0.5 if data_source == 'ws' else 2
-                key = sleep_with_key(cycle_time)
-                if key in ('u', 'd'):
-                    buy_dir = 'up' if key == 'u' else 'down'
-                    _, session.balance, session.last_action = handle_buy(
-                        client, buy_dir, trade_amount, session.token_up, session.token_down,
-                        session.positions, session.balance, radar_logger,
-                        session.session_pnl, get_price, _executor, reason="manual")
-                    draw_panel(now_str, session.balance, btc_price, bin_direction, confidence,
-                               binance_data, session.market_slug, current_time, up_buy,
-                               down_buy, session.positions, session.current_signal, trade_amount,
-                               session.alert_active, session.alert_side, session.alert_price,
-                               session.session_pnl, session.trade_count,
-                               regime=current_regime, phase=current_phase,
-                               data_source=data_source, ws_status=binance_ws.status,
-                               price_to_beat=session.price_to_beat,
-                               trade_history=session.trade_history,
-                               last_action=session.last_action, asset_name=config.display_name,
-                               poly_latency_ms=session.poly_latency_ms)
-                elif key == 'c':
-                    # Show closing status in static panel
-                    session.set_status(f"{Y}{B}EMERGENCY CLOSE...{X}", duration=5)
-                    session.last_action = f"{R}{B}EMERGENCY CLOSE{X}"
-                    draw_panel(now_str, session.balance, btc_price, bin_direction, confidence,
-                               binance_data, session.market_slug, current_time, up_buy,
-                               down_buy, session.positions, session.current_signal, trade_amount,
-                               session.alert_active, session.alert_side, session.alert_price,
-                               session.session_pnl, session.trade_count,
-                               regime=current_regime, phase=current_phase,
-                               data_source=data_source, status_msg=session.status_msg,
-                               ws_status=binance_ws.status,
-                               price_to_beat=session.price_to_beat,
-                               trade_history=session.trade_history,
-                               last_action=session.last_action, asset_name=config.display_name,
-                               poly_latency_ms=session.poly_latency_ms)
-                    msg = execute_close_market(client, session.token_up, session.token_down,
-                                              get_price, _executor)
-                    if session.positions:
-                        total_pnl, cnt, session.session_pnl, pnl_list = close_all_positions(
-                            session.positions, session.token_up, session.token_down,
-                            radar_logger, "emergency",
-                            session.session_pnl, session.trade_history, get_price)
-                        session.trade_count += cnt
-                        for d, sh, ep, xp, pnl in pnl_list:
-                            session.balance += xp * sh
-                    # Show result in static panel
-                    pnl_color = G if session.session_pnl >= 0 else R
-                    session.set_status(
-                        f"{G}✓ Closed{X} │ {pnl_color}{B}P&L: {'+' if session.session_pnl >= 0 else ''}${session.session_pnl:.2f}{X} {D}({session.trade_count} trades){X}",
-                        duration=5)
-                    session.last_action = f"{G}✓ CLOSED{X} │ {pnl_color}P&L: {'+' if session.session_pnl >= 0 else ''}${session.session_pnl:.2f}{X}"
-                    draw_panel(now_str, session.balance, btc_price, bin_direction, confidence,
-                               binance_data, session.market_slug, current_time, up_buy,
-                               down_buy, session.positions, session.current_signal, trade_amount,
-                               session.alert_active, session.alert_side, session.alert_price,
-                               session.session_pnl, session.trade_count,
-                               regime=current_regime, phase=current_phase,
-                               data_source=data_source, status_msg=session.status_msg,
-                               ws_status=binance_ws.status,
-                               price_to_beat=session.price_to_beat,
-                               trade_history=session.trade_history,
-                               last_action=session.last_action, asset_name=config.display_name,
-                               poly_latency_ms=session.poly_latency_ms)
-                elif key == 'q':
-                    raise KeyboardInterrupt
+                key = sleep_with_key(max(0.0, tick + cycle_time - time.monotonic()))
+                if key is None and data_source == 'ws':
+                    # Nothing new on the stream yet: keep waiting for it (keys still
+                    # polled) instead of re-analysing identical candles
+                    key = sleep_with_key(max(0.0, tick + WS_IDLE_MAX_WAIT - time.monotonic()),
+                                         wake=binance_ws.new_data)
+                handler = hotkeys.get(key)
+                if handler:
+                    handler(key)
 
             except KeyboardInterrupt:
+                _stop_renderer()
                 # Reset scroll region, clear screen
-                sys.stdout.write("\033[r")
-                sys.stdout.write("\033[2J\033[H")
+                sys.stdout.write("\033[r\033[2J\033[H")
                 sys.stdout.flush()
                 if session.positions:
                     print(f"{Y}Positions kept open (not closed on exit){X}")
 
                 # Session summary
-                duration_min = (time.time() - session_start) / 60
+                duration_min = (time.monotonic() - session_start) / 60
                 stats = print_session_summary(duration_min, session.trade_count,
                                               session.session_pnl, session.trade_history)
 
                 # Log session to CSV
+                end = time.localtime()
                 radar_logger.log_session_summary({
-                    "date": datetime.now().strftime("%Y-%m-%d"),
+                    "date": time.strftime("%Y-%m-%d", end),
                     "start_time": session_start_str,
-                    "end_time": datetime.now().strftime("%H:%M:%S"),
+                    "end_time": time.strftime("%H:%M:%S", end),
                     "duration_min": duration_min,
                     "total_trades": session.trade_count,
                     "wins": stats['wins'], "losses": stats['losses'],
@@ -795,8 +971,11 @@ def main():
                     raise KeyboardInterrupt
 
     finally:
-        # Stop WebSocket
+        _stop_renderer()
+        # Stop WebSockets
         binance_ws.stop()
+        market_ws.stop()
+        stop_order_ws()
         # Shutdown thread pool (wait=True to prevent resource leaks)
         _executor.shutdown(wait=True)
         # Restore terminal
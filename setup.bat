@@ -81,7 +81,7 @@ REM Verify imports
 echo.
 echo Verifying imports...
 call venv\Scripts\activate.bat
-py -c "from dotenv import load_dotenv; from py_clob_client.client import ClobClient; from web3 import Web3; from eth_account import Account; import requests; print('[OK] All imports working')"
+py -c "from dotenv import load_dotenv; from py_clob_client.client import ClobClient; from web3 import Web3; from eth_account import Account; import httpx; print('[OK] All imports working')"
 if %errorlevel% neq 0 (
     echo [!!] Some imports failed. Try: venv\Scripts\activate.bat then pip install -r requirements.txt
     pause
@@ -65,7 +65,7 @@ from dotenv import load_dotenv
 from py_clob_client.client import ClobClient
 from web3 import Web3
 from eth_account import Account
-import requests
+import httpx
 " 2>/dev/null; then
     echo "[OK] All imports working"
 else
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for Binance and Polymarket REST calls.
+One HTTP/2 connection pool for the whole process: keep-alive connections are
+reused across modules and concurrent requests to the same host are multiplexed.
+JSON bodies are decoded with orjson when installed (stdlib json otherwise).
+keep_warm() pings a host in the background so its connection survives idle
+stretches (e.g. while quotes come from the WebSocket) and the next HTTP quote
+does not pay a fresh TLS handshake.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+
+import httpx
+
+try:
+    import orjson
+    json_loads = orjson.loads  # raises orjson.JSONDecodeError (a ValueError)
+    HAS_ORJSON = True
+except ImportError:
+    json_loads = json.loads
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = 10
+KEEPALIVE_EXPIRY = 60      # seconds an idle pooled connection is kept (httpx default: 5)
+KEEPALIVE_PING_SEC = 20    # keep_warm() interval, below the servers' idle timeouts
+
+# httpx.Client is thread-safe, so executor workers can share it
+session = httpx.Client(
+    http2=True,
+    timeout=HTTP_TIMEOUT,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100,
+                        keepalive_expiry=KEEPALIVE_EXPIRY),
+)
+
+
+def read_json(resp: httpx.Response):
+    """Decode a response body straight from bytes (skips httpx's text decoding)."""
+    return json_loads(resp.content)
+
+
+def keep_warm(url: str, interval: float = KEEPALIVE_PING_SEC) -> threading.Thread:
+    """Start a daemon thread that GETs `url` every `interval` seconds.
+    Any cheap endpoint works (e.g. CLOB /time); failures are only logged."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                session.get(url)
+            except httpx.HTTPError as e:
+                logger.debug("Keep-alive ping to %s failed: %s", url, e)
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    return thread
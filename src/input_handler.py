@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import os
 import sys
+import threading
 import time
 import platform
 
@@ -12,60 +14,172 @@ if IS_WINDOWS:
     import msvcrt
 else:
     import select
+    import selectors
+
+WAKE_POLL = 0.05  # seconds between wake-event checks while waiting on stdin
 
 from colors import Y, B, X
 
 
-def read_key_nb():
+def _read_key_nb_win():
+    """Read key without blocking. Returns char or None."""
+    if msvcrt.kbhit():
+        ch = msvcrt.getch()
+        try:
+            return ch.decode('utf-8').lower()
+        except (UnicodeDecodeError, AttributeError):
+            return None
+    return None
+
+
+def _read_key_nb_posix():
     """Read key without blocking. Returns char or None."""
-    if IS_WINDOWS:
-        if msvcrt.kbhit():
-            ch = msvcrt.getch()
+    if select.select([sys.stdin], [], [], 0)[0]:
+        return sys.stdin.read(1).lower()
+    return None
+
+
+# Platform picked once at import; callers use the plain names
+read_key_nb = _read_key_nb_win if IS_WINDOWS else _read_key_nb_posix
+
+
+class WakeEvent(threading.Event):
+    """threading.Event backed by a self-pipe, so sleep_with_key() can wait on
+    it and stdin in the same select() (POSIX): neither a key press nor a set()
+    waits for a polling slice. Call close() when done to release the pipe.
+    On Windows (consoles cannot be selected) it is a plain Event."""
+
+    def __init__(self):
+        super().__init__()
+        self._r = self._w = None
+        if not IS_WINDOWS:
+            self._r, self._w = os.pipe()
+            os.set_blocking(self._r, False)
+            os.set_blocking(self._w, False)
+
+    def fileno(self):
+        return self._r
+
+    def set(self):
+        super().set()
+        if self._w is not None:
             try:
-                return ch.decode('utf-8').lower()
-            except (UnicodeDecodeError, AttributeError):
-                return None
-        return None
-    else:
-        if select.select([sys.stdin], [], [], 0)[0]:
-            return sys.stdin.read(1).lower()
-        return None
+                os.write(self._w, b"x")
+            except OSError:
+                pass  # pipe already full (still readable) or closed
+
+    def clear(self):
+        # Drain before clearing: a set() in between then leaves a byte behind
+        # (one spurious wake-up) instead of a set flag nobody is woken for
+        if self._r is not None:
+            try:
+                while os.read(self._r, 512):
+                    pass
+            except OSError:
+                pass
+        super().clear()
+
+    def close(self):
+        for fd in (self._r, self._w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._r = self._w = None
 
 
 def wait_for_key(timeout_sec=10):
-    """Wait for key press up to timeout_sec."""
-    start = time.time()
-    while time.time() - start < timeout_sec:
-        remaining = timeout_sec - (time.time() - start)
-        sys.stdout.write(f"\r   {Y}{B}>>> S=execute U=UP D=DOWN | wait {int(remaining)}s to ignore <<<{X}  ")
+    """Wait for key press up to timeout_sec.
+    The countdown prompt is redrawn only when its whole-second value changes;
+    in between, sleep_with_key() blocks until a key or the next second."""
+    deadline = time.monotonic() + timeout_sec
+    key = None
+    while key is None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        shown = int(remaining)
+        sys.stdout.write(f"\r   {Y}{B}>>> S=execute U=UP D=DOWN | wait {shown}s to ignore <<<{X}  ")
         sys.stdout.flush()
-        if IS_WINDOWS:
-            if msvcrt.kbhit():
-                ch = msvcrt.getch()
-                sys.stdout.write("\r" + " " * 80 + "\r")
-                sys.stdout.flush()
-                try:
-                    return ch.decode('utf-8').lower()
-                except (UnicodeDecodeError, AttributeError):
-                    continue
-            time.sleep(0.1)
-        else:
-            if select.select([sys.stdin], [], [], 0.5)[0]:
-                ch = sys.stdin.read(1)
-                sys.stdout.write("\r" + " " * 80 + "\r")
-                sys.stdout.flush()
-                return ch.lower()
+        key = sleep_with_key(remaining - shown)
     sys.stdout.write("\r" + " " * 80 + "\r")
     sys.stdout.flush()
-    return None
+    return key
+
 
+_selector = None
 
-def sleep_with_key(seconds):
-    """Sleep for N seconds but returns key if pressed."""
-    steps = int(seconds / 0.1)
-    for _ in range(steps):
-        key = read_key_nb()
+
+def _stdin_selector():
+    """Selector with stdin registered for reading (created on first use)."""
+    global _selector
+    if _selector is None:
+        _selector = selectors.DefaultSelector()
+        try:
+            _selector.register(sys.stdin, selectors.EVENT_READ)
+        except PermissionError:
+            # epoll refuses regular files (stdin redirected from a file); select() takes them
+            _selector = selectors.SelectSelector()
+            _selector.register(sys.stdin, selectors.EVENT_READ)
+    return _selector
+
+
+def _sleep_with_key_win(seconds, wake=None):
+    """Sleep for N seconds but returns key if pressed.
+    If `wake` (a threading.Event) is given, also returns None as soon as it is set.
+    Windows consoles cannot be selected, so msvcrt is polled every 0.1s."""
+    deadline = time.monotonic() + seconds
+    while True:
+        key = _read_key_nb_win()
         if key:
             return key
-        time.sleep(0.1)
-    return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        if wake is None:
+            time.sleep(min(0.1, remaining))
+        elif wake.wait(min(0.1, remaining)):
+            return None
+
+
+def _sleep_with_key_posix(seconds, wake=None):
+    """Sleep for N seconds but returns key if pressed.
+    If `wake` (a threading.Event) is given, also returns None as soon as it is set.
+    Blocks in select() on stdin, so a key press ends the wait immediately."""
+    deadline = time.monotonic() + seconds
+    if isinstance(wake, WakeEvent):
+        # Selectable: one select() on stdin and the event's pipe, no slicing
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or wake.is_set():
+                return None
+            ready = select.select([sys.stdin, wake], [], [], remaining)[0]
+            if sys.stdin in ready:
+                ch = sys.stdin.read(1)
+                if ch:
+                    return ch.lower()
+                wake.wait(max(0.0, deadline - time.monotonic()))  # stdin at EOF
+                return None
+    sel = _stdin_selector()
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        # An Event cannot be selected on, so with `wake` the wait is sliced
+        if sel.select(remaining if wake is None else min(WAKE_POLL, remaining)):
+            ch = sys.stdin.read(1)
+            if ch:
+                return ch.lower()
+            # stdin at EOF stays readable: wait out the rest without it
+            if wake is None:
+                time.sleep(remaining)
+            else:
+                wake.wait(remaining)
+            return None
+        if wake is not None and wake.is_set():
+            return None
+
+
+# Platform picked once at import, like read_key_nb
+sleep_with_key = _sleep_with_key_win if IS_WINDOWS else _sleep_with_key_posix
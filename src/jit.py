@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Optional Numba JIT support.
+`njit` compiles with Numba when installed and is a no-op decorator otherwise,
+so hot loops can be written once and still run as plain Python.
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Fallback: return the function unchanged (supports @njit and @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -2,6 +2,9 @@
 """
 Logging module for Polymarket Scalp Radar.
 Writes signal snapshots, trade events, and session summaries to CSV files.
+Signal and trade rows are queued and written by a background thread, so the
+radar loop never waits on formatting or disk I/O. Trade rows are flushed once
+the queue is drained, so a burst of rows costs a single flush.
 """
 
 from __future__ import annotations
@@ -9,12 +12,14 @@ from __future__ import annotations
 import csv
 import logging
 import os
+import queue
+import threading
 import time
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 LOGS_DIR = os.path.join(os.path.dirname(__file__), "..", "logs")
+LOG_QUEUE_SIZE = 1024
 
 SIGNAL_COLUMNS = [
     "timestamp", "btc_price", "up_buy", "down_buy",
@@ -25,11 +30,22 @@ SIGNAL_COLUMNS = [
     "regime", "phase",
 ]
 
+# Signal rows are written with one %-format instead of csv.writer: every
+# field is a number, a bool or a fixed enum string, so nothing needs quoting.
+# "\r\n" matches the csv module's line terminator used for the header.
+SIGNAL_FMT = (
+    "%s,%.2f,%.4f,%.4f,%.1f,%.2f,%.3f,%s,%s,%.4f,%.3f,%.3f,%.4f,%s,%.4f,%.4f,%.4f,%s,%s\r\n"
+)
+SIGNAL_FMT_NO_SIGNAL = "%s,%.2f,%.4f,%.4f,%.1f,%.2f,,,,,,,,,,,,%s,%s\r\n"
+
 TRADE_COLUMNS = [
     "timestamp", "action", "direction", "shares", "price",
     "amount_usd", "reason", "pnl", "session_pnl",
 ]
 
+# Same approach as SIGNAL_FMT: action, direction and reason are fixed enums
+TRADE_FMT = "%s,%s,%s,%.2f,%.4f,%.2f,%s,%.2f,%.2f\r\n"
+
 SESSION_COLUMNS = [
     "date", "start_time", "end_time", "duration_min",
     "total_trades", "wins", "losses",
@@ -48,12 +64,50 @@ class RadarLogger:
         self._signal_file = None
         self._trade_writer = None
         self._trade_file = None
+        self._trade_dirty = False  # trade rows written but not flushed yet
         self._signal_count = 0
         self._current_date = None
-
-    def _ensure_files(self):
-        """Open or rotate CSV files based on current date."""
-        today = datetime.now().strftime("%Y-%m-%d")
+        self._last_sec = None
+        self._last_stamp = ""
+        self._queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+
+    def _writer_loop(self):
+        """Background thread: drain the queue and write rows (None = stop)."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                kind, args = item
+                if kind == "signal":
+                    self._write_signal(*args)
+                else:
+                    self._write_trade(*args)
+                if self._trade_dirty and self._queue.empty():
+                    self._flush_trades()
+            finally:
+                self._queue.task_done()
+
+    def _flush_trades(self):
+        self._trade_dirty = False
+        try:
+            if self._trade_file:
+                self._trade_file.flush()
+        except OSError as e:
+            logger.debug("Error flushing trade log: %s", e)
+
+    def _stamp(self, ts_ns: int) -> str:
+        """Format an event time, reusing the string while the second is unchanged."""
+        sec = ts_ns // 1_000_000_000
+        if sec != self._last_sec:
+            self._last_stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._last_sec = sec
+        return self._last_stamp
+
+    def _ensure_files(self, today: str):
+        """Open or rotate CSV files based on the event's date (YYYY-MM-DD)."""
         if today == self._current_date:
             return
 
@@ -91,53 +145,56 @@ class RadarLogger:
         self._trade_writer = None
 
     def log_signal(self, btc_price: float, up_buy: float, down_buy: float, signal: dict | None, binance_data: dict, regime: str = "", phase: str = "") -> None:
-        """Log one signal snapshot (called every radar cycle ~2s)."""
+        """Queue one signal snapshot (called every radar cycle ~2s).
+        Dropped if the writer has fallen behind — a missing snapshot is
+        better than stalling the radar loop."""
         try:
-            self._ensure_files()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._queue.put_nowait(("signal", (time.time_ns(), btc_price, up_buy, down_buy, signal, binance_data, regime, phase)))
+        except queue.Full:
+            logger.debug("Signal log queue full, snapshot dropped")
+
+    def log_trade(self, action: str, direction: str, shares: float, price: float, amount_usd: float, reason: str, pnl: float = 0.0, session_pnl: float = 0.0) -> None:
+        """Queue a trade event (BUY, SELL, CLOSE). Never dropped."""
+        self._queue.put(("trade", (time.time_ns(), action, direction, shares, price, amount_usd, reason, pnl, session_pnl)))
+
+    def _write_signal(self, ts_ns, btc_price, up_buy, down_buy, signal, binance_data, regime, phase):
+        try:
+            now = self._stamp(ts_ns)
+            self._ensure_files(now[:10])
 
             rsi = binance_data.get("rsi", 0)
             atr = binance_data.get("atr", 0)
 
             if signal:
-                row = [
-                    now, f"{btc_price:.2f}", f"{up_buy:.4f}", f"{down_buy:.4f}",
-                    f"{rsi:.1f}", f"{atr:.2f}", f"{signal.get('trend', 0):.3f}",
-                    signal.get("direction", ""), signal.get("strength", 0),
-                    f"{signal.get('score', 0):.4f}",
-                    f"{signal.get('sr_raw', 0):.3f}", f"{signal.get('sr_adj', 0):.3f}",
-                    f"{signal.get('vol_pct', 0):.4f}", signal.get("high_vol", False),
-                    f"{signal.get('macd_hist', 0):.4f}",
-                    f"{signal.get('vwap_pos', 0):.4f}",
-                    f"{signal.get('bb_pos', 0):.4f}",
-                    regime, phase,
-                ]
+                line = SIGNAL_FMT % (
+                    now, btc_price, up_buy, down_buy, rsi, atr,
+                    signal.get("trend", 0), signal.get("direction", ""),
+                    signal.get("strength", 0), signal.get("score", 0),
+                    signal.get("sr_raw", 0), signal.get("sr_adj", 0),
+                    signal.get("vol_pct", 0), signal.get("high_vol", False),
+                    signal.get("macd_hist", 0), signal.get("vwap_pos", 0),
+                    signal.get("bb_pos", 0), regime, phase,
+                )
             else:
-                row = [now, f"{btc_price:.2f}", f"{up_buy:.4f}", f"{down_buy:.4f}",
-                       f"{rsi:.1f}", f"{atr:.2f}", "", "", "", "", "", "", "", "",
-                       "", "", "", regime, phase]
+                line = SIGNAL_FMT_NO_SIGNAL % (now, btc_price, up_buy, down_buy, rsi, atr, regime, phase)
 
-            self._signal_writer.writerow(row)
+            self._signal_file.write(line)
             self._signal_count += 1
 
             # Flush every 10 rows for performance
             if self._signal_count % 10 == 0:
                 self._signal_file.flush()
-        except (OSError, csv.Error) as e:
+        except (OSError, TypeError) as e:
             logger.debug("Error writing signal log: %s", e)
 
-    def log_trade(self, action: str, direction: str, shares: float, price: float, amount_usd: float, reason: str, pnl: float = 0.0, session_pnl: float = 0.0) -> None:
-        """Log a trade event (BUY, SELL, CLOSE)."""
+    def _write_trade(self, ts_ns, action, direction, shares, price, amount_usd, reason, pnl, session_pnl):
         try:
-            self._ensure_files()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            row = [
-                now, action, direction, f"{shares:.2f}", f"{price:.4f}",
-                f"{amount_usd:.2f}", reason, f"{pnl:.2f}", f"{session_pnl:.2f}",
-            ]
-            self._trade_writer.writerow(row)
-            self._trade_file.flush()
-        except (OSError, csv.Error) as e:
+            now = self._stamp(ts_ns)
+            self._ensure_files(now[:10])
+            self._trade_file.write(TRADE_FMT % (
+                now, action, direction, shares, price, amount_usd, reason, pnl, session_pnl))
+            self._trade_dirty = True
+        except (OSError, TypeError) as e:
             logger.debug("Error writing trade log: %s", e)
 
     def log_session_summary(self, stats: dict) -> None:
@@ -168,5 +225,8 @@ class RadarLogger:
             logger.debug("Error writing session summary: %s", e)
 
     def close(self) -> None:
-        """Close all open files."""
+        """Write any queued rows, stop the writer thread and close all files."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
         self._close_files()
@@ -5,13 +5,15 @@ Shared functions for Polymarket connection and operations
 
 from __future__ import annotations
 
-import json
+import functools
 import logging
 import os
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 
-import requests
+import httpx
 from dotenv import load_dotenv
 from eth_account import Account
 from web3 import Web3
@@ -22,16 +24,15 @@ from py_clob_client.clob_types import (
     OpenOrderParams,
 )
 from py_clob_client.constants import POLYGON
+from http_client import json_loads, read_json, session as _session
 from market_config import MarketConfig
+from ws_polymarket import OrderWS
 
 logger = logging.getLogger(__name__)
 
 GAMMA = "https://gamma-api.polymarket.com"
 CLOB = "https://clob.polymarket.com"
 
-# Persistent HTTP session (reuses TCP connections via keep-alive)
-_session = requests.Session()
-
 # Polymarket Proxy Wallet Factory (Polygon)
 PROXY_FACTORY = "0xaB45c5A4B0c941a2F231C04C3f49182e1A254052"
 PROXY_INIT_CODE_HASH = bytes.fromhex(
@@ -42,9 +43,28 @@ UTC = timezone.utc
 ET = timezone(timedelta(hours=-5))
 BRASILIA = timezone(timedelta(hours=-3))
 
+# REST re-check interval for monitor_order while the user-channel WS is up
+ORDER_WS_RESYNC_SEC = 15
+
+# User-channel order feed (set by start_order_ws)
+_order_ws = None
+
+# find_current_market results: (slug_prefix, window_start_ts) -> (event, market, token_up, token_down, end_date)
+_market_cache = {}
+MARKET_CACHE_MIN_LEFT_SEC = 5  # stop reusing a window this close to its end
+
+# get_token_position results: token_id -> (shares, fetched_at monotonic).
+# Back-to-back reads (position sync, exposure check, close) share one REST
+# call; trade_executor drops a token's entry after each of our own orders.
+POSITION_TTL = 0.5
+_positions = {}
 
+
+@functools.lru_cache(maxsize=1)
 def load_config() -> tuple[str, float]:
-    """Loads .env and returns configuration"""
+    """Loads .env and returns configuration.
+    Cached after the first successful call (errors are not cached);
+    call load_config.cache_clear() to re-read .env."""
     load_dotenv()
     private_key = os.getenv("POLYMARKET_API_KEY")
     limit = float(os.getenv("POSITION_LIMIT", "0"))
@@ -55,8 +75,10 @@ def load_config() -> tuple[str, float]:
     return private_key, limit
 
 
+@functools.lru_cache(maxsize=8)
 def derive_proxy_address(eoa_address: str) -> str:
-    """Derives proxy wallet address via CREATE2 (Polymarket factory)"""
+    """Derives proxy wallet address via CREATE2 (Polymarket factory).
+    Deterministic per EOA, so the two keccak256 hashes run once per address."""
     eoa_bytes = bytes.fromhex(eoa_address.lower().replace("0x", ""))
     salt = Web3.keccak(eoa_bytes)
     proxy = Web3.keccak(
@@ -93,6 +115,31 @@ def create_client() -> tuple:
     return client, limit
 
 
+def start_order_ws(client) -> bool:
+    """Start the user-channel WebSocket used by monitor_order() (needs API creds)."""
+    global _order_ws
+    if _order_ws is None:
+        _order_ws = OrderWS(client.creds)
+    return _order_ws.start()
+
+
+def stop_order_ws() -> None:
+    """Stop the user-channel WebSocket, if running."""
+    if _order_ws is not None:
+        _order_ws.stop()
+
+
+def _open_orders_value(orders, buy_only: bool = False) -> float:
+    """Sum of unfilled size * price over an order list (orders API response)."""
+    order_list = orders if isinstance(orders, list) else orders.get("data", [])
+    remaining_prices = (
+        (float(o.get("original_size", 0)) - float(o.get("size_matched", 0)), float(o.get("price", 0)))
+        for o in order_list
+        if not buy_only or o.get("side", "").upper() == "BUY"
+    )
+    return sum(remaining * price for remaining, price in remaining_prices if remaining > 0 and price > 0)
+
+
 def get_balance(client) -> float:
     """Returns available USDC balance (deducting open buy orders)"""
     resp = client.get_balance_allowance(
@@ -106,27 +153,23 @@ def get_balance(client) -> float:
     # Deduct value locked in open buy orders
     try:
         orders = client.get_orders(params=OpenOrderParams())
-        order_list = orders if isinstance(orders, list) else orders.get("data", [])
-        locked = 0.0
-        for order in order_list:
-            if order.get("side", "").upper() == "BUY":
-                price = float(order.get("price", 0))
-                size = float(order.get("original_size", 0))
-                size_matched = float(order.get("size_matched", 0))
-                remaining = size - size_matched
-                if remaining > 0 and price > 0:
-                    locked += remaining * price
-        total_balance -= locked
+        total_balance -= _open_orders_value(orders, buy_only=True)
     except (KeyError, ValueError, TypeError) as e:
         logger.debug("Error calculating locked balance: %s", e)
 
     return max(total_balance, 0.0)
 
 
+# fromisoformat() accepts a trailing "Z" natively from Python 3.11
+_ISO_NEEDS_Z_FIX = sys.version_info < (3, 11)
+
+
 def parse_iso(s):
-    if s.endswith("Z"):
-        s = s.replace("Z", "+00:00")
-    return datetime.fromisoformat(s).astimezone(UTC)
+    if _ISO_NEEDS_Z_FIX and s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    dt = datetime.fromisoformat(s)
+    # "+00:00"/"Z" parse to the timezone.utc singleton: no conversion needed
+    return dt if dt.tzinfo is UTC else dt.astimezone(UTC)
 
 
 def coerce_list(maybe_list):
@@ -134,9 +177,9 @@ def coerce_list(maybe_list):
         return maybe_list
     if isinstance(maybe_list, str):
         try:
-            v = json.loads(maybe_list)
+            v = json_loads(maybe_list)
             return v if isinstance(v, list) else []
-        except (json.JSONDecodeError, TypeError) as e:
+        except (ValueError, TypeError) as e:
             logger.debug("coerce_list parse error: %s", e)
             return []
     return []
@@ -145,6 +188,7 @@ def coerce_list(maybe_list):
 def find_current_market(config=None) -> tuple:
     """
     Finds the active updown market for the configured asset and window.
+    The lookup is cached per window; only time_to_close_min is recomputed.
     Args:
         config: MarketConfig instance (if None, uses default btc/15m)
     Returns (event, market, token_up, token_down, time_to_close_min)
@@ -165,6 +209,16 @@ def find_current_market(config=None) -> tuple:
     window_start = now_et.replace(minute=window_start_minute, second=0, microsecond=0)
     window_start_utc = window_start.astimezone(UTC)
     target_timestamp = int(window_start_utc.timestamp())
+
+    global _market_cache
+    cache_key = (slug_prefix, target_timestamp)
+    cached = _market_cache.get(cache_key)
+    if cached:
+        event, market, token_up, token_down, end_date = cached
+        time_remaining_sec = (end_date - datetime.now(UTC)).total_seconds()
+        if time_remaining_sec > MARKET_CACHE_MIN_LEFT_SEC:
+            return event, market, token_up, token_down, time_remaining_sec / 60
+
     rounded = round(target_timestamp / window_sec) * window_sec
 
     possible_timestamps = [rounded, target_timestamp, rounded - window_sec, rounded + window_sec]
@@ -174,8 +228,9 @@ def find_current_market(config=None) -> tuple:
         slug = f"{slug_prefix}-{ts}"
         try:
             r = _session.get(f"{GAMMA}/events", params={"slug": slug}, timeout=10)
-            if r.status_code == 200 and r.json():
-                ev = r.json()[0]
+            events = read_json(r) if r.status_code == 200 else None
+            if events:
+                ev = events[0]
                 markets = ev.get("markets") or []
                 if markets:
                     m = markets[0]
@@ -184,7 +239,7 @@ def find_current_market(config=None) -> tuple:
                     if diff < 120:
                         event = ev
                         break
-        except (requests.RequestException, KeyError, ValueError) as e:
+        except (httpx.HTTPError, KeyError, ValueError) as e:
             logger.debug("Market slug lookup error (attempt %d): %s", i + 1, e)
             time.sleep(min(0.2 * (2 ** i), 2.0))  # exponential backoff: 0.2, 0.4, 0.8, 1.6
             continue
@@ -214,11 +269,20 @@ def find_current_market(config=None) -> tuple:
     now_utc = datetime.now(UTC)
     time_remaining = (end_date - now_utc).total_seconds() / 60
 
+    # Keep only the current window (and anything newer)
+    _market_cache = {k: v for k, v in _market_cache.items() if k[1] >= target_timestamp}
+    _market_cache[cache_key] = (event, market, token_up, token_down, end_date)
+
     return event, market, token_up, token_down, time_remaining
 
 
 def get_token_position(client, token_id: str) -> float:
-    """Returns share quantity of a conditional token"""
+    """Returns share quantity of a conditional token.
+    Reused for POSITION_TTL seconds (errors are not cached)."""
+    now = time.monotonic()
+    hit = _positions.get(token_id)
+    if hit and now - hit[1] < POSITION_TTL:
+        return hit[0]
     try:
         resp = client.get_balance_allowance(
             params=BalanceAllowanceParams(
@@ -227,28 +291,46 @@ def get_token_position(client, token_id: str) -> float:
                 signature_type=1,
             )
         )
-        return float(resp.get("balance", 0)) / 1e6
+        shares = float(resp.get("balance", 0)) / 1e6
+        _positions[token_id] = (shares, now)
+        return shares
     except (KeyError, ValueError, TypeError) as e:
         logger.debug("Error getting token position: %s", e)
         return 0.0
 
 
+def invalidate_positions(*token_ids) -> None:
+    """Drop cached positions for the given tokens, or all of them.
+    Called after our own orders, which change the balance just read."""
+    if not token_ids:
+        _positions.clear()
+        return
+    for token_id in token_ids:
+        _positions.pop(token_id, None)
+
+
 def get_open_orders_value(client, token_id: str) -> float:
     """Returns total USD value of open orders for a token"""
-    total = 0.0
     try:
         resp = client.get_orders(params=OpenOrderParams(asset_id=token_id))
-        orders = resp if isinstance(resp, list) else resp.get("data", [])
-        for order in orders:
-            price = float(order.get("price", 0))
-            size = float(order.get("original_size", 0))
-            size_matched = float(order.get("size_matched", 0))
-            remaining = size - size_matched
-            if remaining > 0 and price > 0:
-                total += remaining * price
-    except (KeyError, ValueError, TypeError) as e:
+        return _open_orders_value(resp)
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
         logger.debug("Error calculating open orders: %s", e)
-    return total
+        return 0.0
+
+
+def _get_sell_price(token_id: str) -> float:
+    """Current SELL price of a token from the CLOB (0.0 on error)."""
+    try:
+        r = _session.get(
+            f"{CLOB}/price",
+            params={"token_id": token_id, "side": "SELL"},
+            timeout=10,
+        )
+        return float(read_json(r)["price"])
+    except (httpx.HTTPError, KeyError, ValueError) as e:
+        logger.debug("Error fetching price: %s", e)
+        return 0.0
 
 
 def check_limit(client, token_up: str, token_down: str, new_order_value: float) -> tuple[bool, float, float]:
@@ -258,34 +340,17 @@ def check_limit(client, token_up: str, token_down: str, new_order_value: float)
     """
     _, limit = load_config()
 
-    # Value of open positions (shares * current price)
-    up_shares = get_token_position(client, token_up)
-    down_shares = get_token_position(client, token_down)
+    # Current prices to calculate USD value (both in flight while positions load)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        up_fut = ex.submit(_get_sell_price, token_up)
+        down_fut = ex.submit(_get_sell_price, token_down)
 
-    # Current prices to calculate USD value
-    try:
-        up_price = float(
-            _session.get(
-                f"{CLOB}/price",
-                params={"token_id": token_up, "side": "SELL"},
-                timeout=10,
-            ).json()["price"]
-        )
-    except (requests.RequestException, KeyError, ValueError) as e:
-        logger.debug("Error fetching price: %s", e)
-        up_price = 0.0
+        # Value of open positions (shares * current price)
+        up_shares = get_token_position(client, token_up)
+        down_shares = get_token_position(client, token_down)
 
-    try:
-        down_price = float(
-            _session.get(
-                f"{CLOB}/price",
-                params={"token_id": token_down, "side": "SELL"},
-                timeout=10,
-            ).json()["price"]
-        )
-    except (requests.RequestException, KeyError, ValueError) as e:
-        logger.debug("Error fetching price: %s", e)
-        down_price = 0.0
+        up_price = up_fut.result()
+        down_price = down_fut.result()
 
     position_value = (up_shares * up_price) + (down_shares * down_price)
 
@@ -308,67 +373,89 @@ def monitor_order(client, order_id: str, interval: int = 3, timeout_sec: int = 3
     """
     start = time.time()
     last_status = None
+    cancel_requested = False
+    order_ws = _order_ws
+    if order_ws is not None:
+        order_ws.watch(order_id)
 
-    while True:
-        # Check external cancellation
-        if cancel_fn and cancel_fn():
-            if not quiet:
-                print(f"\n   Cancelling order (ESC)...")
-            try:
-                client.cancel(order_id)
-            except Exception as e:
-                logger.debug("Error cancelling order: %s", e)
-            return "CANCELLED", None
+    try:
+        while True:
+            # Check external cancellation
+            if cancel_requested or (cancel_fn and cancel_fn()):
+                if not quiet:
+                    print(f"\n   Cancelling order (ESC)...")
+                try:
+                    client.cancel(order_id)
+                except Exception as e:
+                    logger.debug("Error cancelling order: %s", e)
+                return "CANCELLED", None
+
+            elapsed = time.time() - start
+            if elapsed > timeout_sec:
+                if not quiet:
+                    print(f"\n   Timeout ({timeout_sec}s) reached. Cancelling order...")
+                try:
+                    client.cancel(order_id)
+                except Exception as e:
+                    logger.debug("Error cancelling timed-out order: %s", e)
+                return "TIMEOUT", None
 
-        elapsed = time.time() - start
-        if elapsed > timeout_sec:
-            if not quiet:
-                print(f"\n   Timeout ({timeout_sec}s) reached. Cancelling order...")
             try:
-                client.cancel(order_id)
+                order = client.get_order(order_id)
             except Exception as e:
-                logger.debug("Error cancelling timed-out order: %s", e)
-            return "TIMEOUT", None
+                if not quiet:
+                    print(f"\n   Error querying order: {e}")
+                time.sleep(interval)
+                continue
 
-        try:
-            order = client.get_order(order_id)
-        except Exception as e:
-            if not quiet:
-                print(f"\n   Error querying order: {e}")
-            time.sleep(interval)
-            continue
-
-        status = order.get("status", "UNKNOWN") if isinstance(order, dict) else "UNKNOWN"
-        size_matched = float(order.get("size_matched", 0)) if isinstance(order, dict) else 0
-        original_size = float(order.get("original_size", 0)) if isinstance(order, dict) else 0
-
-        if status != last_status:
-            last_status = status
-
-        # Show progress
-        if not quiet:
-            if original_size > 0:
-                pct = (size_matched / original_size) * 100
-                print(f"\r   Status: {status} | Filled: {pct:.1f}% ({size_matched:.2f}/{original_size:.2f}) | {elapsed:.0f}s", end="", flush=True)
-            else:
-                print(f"\r   Status: {status} | {elapsed:.0f}s", end="", flush=True)
+            status = order.get("status", "UNKNOWN") if isinstance(order, dict) else "UNKNOWN"
+            size_matched = float(order.get("size_matched", 0)) if isinstance(order, dict) else 0
+            original_size = float(order.get("original_size", 0)) if isinstance(order, dict) else 0
 
-        if status == "MATCHED":
-            # Re-query if size_matched == 0 (API race condition)
-            if size_matched == 0 and original_size > 0:
-                time.sleep(2)
-                try:
-                    order = client.get_order(order_id)
-                    size_matched = float(order.get("size_matched", 0)) if isinstance(order, dict) else 0
-                except Exception as e:
-                    logger.debug("Error re-querying order %s: %s", order_id[:8], e)
-            if not quiet:
-                print()
-            return "FILLED", order
+            if status != last_status:
+                last_status = status
 
-        if status in ("CANCELED", "CANCELLED"):
+            # Show progress
             if not quiet:
-                print()
-            return "CANCELLED", order
-
-        time.sleep(interval)
+                if original_size > 0:
+                    pct = (size_matched / original_size) * 100
+                    print(f"\r   Status: {status} | Filled: {pct:.1f}% ({size_matched:.2f}/{original_size:.2f}) | {elapsed:.0f}s", end="", flush=True)
+                else:
+                    print(f"\r   Status: {status} | {elapsed:.0f}s", end="", flush=True)
+
+            if status == "MATCHED":
+                # Re-query if size_matched == 0 (API race condition)
+                if size_matched == 0 and original_size > 0:
+                    time.sleep(2)
+                    try:
+                        order = client.get_order(order_id)
+                        size_matched = float(order.get("size_matched", 0)) if isinstance(order, dict) else 0
+                    except Exception as e:
+                        logger.debug("Error re-querying order %s: %s", order_id[:8], e)
+                if not quiet:
+                    print()
+                return "FILLED", order
+
+            if status in ("CANCELED", "CANCELLED"):
+                if not quiet:
+                    print()
+                return "CANCELLED", order
+
+            # Wait for the next check. With the user-channel WS up and not silent,
+            # sleep until it reports a change to this order (REST re-check at least
+            # every ORDER_WS_RESYNC_SEC); cancel_fn/timeout are still checked each
+            # interval. A silent socket falls back to polling every `interval`.
+            if order_ws is not None and order_ws.is_live:
+                resync_at = time.time() + ORDER_WS_RESYNC_SEC
+                while not order_ws.wait(order_id, interval):
+                    if cancel_fn and cancel_fn():
+                        cancel_requested = True
+                        break
+                    now = time.time()
+                    if now >= resync_at or now - start > timeout_sec or not order_ws.is_live:
+                        break
+            else:
+                time.sleep(interval)
+    finally:
+        if order_ws is not None:
+            order_ws.unwatch(order_id)
@@ -2,11 +2,121 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from colors import G, R, C, W, B, D, X
 
 
+TRADE_HISTORY_CAPACITY = 256  # initial slots; doubled when a session outgrows it
+
+
+class TradeHistory:
+    """Per-trade P&L values with running aggregates.
+
+    Behaves like the list it replaces (append, len, iteration, truthiness);
+    win/loss counts, gross sums, best/worst and max drawdown are updated on
+    append, so the panel and the summary read them without rescanning.
+    Values are stored in a preallocated float64 array: an append is one
+    element write, and no trade is ever dropped (the array doubles when full).
+    extend() folds a whole batch into the aggregates with array operations.
+    """
+
+    def __init__(self, pnls=(), capacity=TRADE_HISTORY_CAPACITY):
+        self._pnls = np.empty(max(capacity, 1), dtype=np.float64)
+        self._n = 0
+        self.wins = 0
+        self.gross_wins = 0.0
+        self._gross_neg = 0.0   # sum of losing trades (negative)
+        self.best = 0.0
+        self.worst = 0.0
+        self._cumul = 0.0
+        self._peak = 0.0
+        self.max_drawdown = 0.0
+        self.extend(pnls)
+
+    def append(self, pnl: float) -> None:
+        n = self._n
+        if not n:
+            self.best = self.worst = pnl
+        elif pnl > self.best:
+            self.best = pnl
+        elif pnl < self.worst:
+            self.worst = pnl
+        if n == len(self._pnls):
+            self._pnls = np.concatenate((self._pnls, np.empty(n, dtype=np.float64)))
+        self._pnls[n] = pnl
+        self._n = n + 1
+        if pnl > 0:
+            self.wins += 1
+            self.gross_wins += pnl
+        elif pnl < 0:
+            self._gross_neg += pnl
+        self._cumul += pnl
+        if self._cumul > self._peak:
+            self._peak = self._cumul
+        elif self._peak - self._cumul > self.max_drawdown:
+            self.max_drawdown = self._peak - self._cumul
+
+    def extend(self, pnls) -> None:
+        """Append several P&L values at once (same aggregates as repeated append())."""
+        a = np.asarray(pnls, dtype=np.float64).ravel()
+        if not a.size:
+            return
+        n = self._n
+        end = n + a.size
+        if end > len(self._pnls):
+            size = len(self._pnls)
+            while size < end:
+                size *= 2
+            grown = np.empty(size, dtype=np.float64)
+            grown[:n] = self._pnls[:n]
+            self._pnls = grown
+        self._pnls[n:end] = a
+        self._n = end
+
+        hi, lo = float(a.max()), float(a.min())
+        self.best = hi if not n else max(self.best, hi)
+        self.worst = lo if not n else min(self.worst, lo)
+        won = a[a > 0]
+        self.wins += won.size
+        self.gross_wins += float(won.sum())
+        self._gross_neg += float(a[a < 0].sum())
+        cumul = self._cumul + np.cumsum(a)
+        peak = np.maximum(np.maximum.accumulate(cumul), self._peak)
+        self._cumul = float(cumul[-1])
+        self._peak = float(peak[-1])
+        self.max_drawdown = max(self.max_drawdown, float((peak - cumul).max()))
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self):
+        return iter(self._pnls[:self._n].tolist())
+
+    def values(self) -> np.ndarray:
+        """Recorded P&L values, oldest first (a view, do not modify)."""
+        return self._pnls[:self._n]
+
+    @property
+    def losses(self) -> int:
+        return self._n - self.wins
+
+    @property
+    def gross_losses(self) -> float:
+        return abs(self._gross_neg)
+
+    @property
+    def win_rate(self) -> float:
+        return (self.wins / self._n * 100) if self._n else 0
+
+    @property
+    def profit_factor(self) -> float:
+        gross_losses = self.gross_losses
+        return (self.gross_wins / gross_losses) if gross_losses > 0 else self.gross_wins
+
+
 def calculate_session_stats(trade_history):
-    """Calculate session statistics from trade history.
+    """Calculate session statistics from trade history (TradeHistory or list of P&L).
 
     Returns dict with: wins, losses, win_rate, best, worst,
     gross_wins, gross_losses, profit_factor, max_drawdown.
@@ -16,53 +126,42 @@ def calculate_session_stats(trade_history):
             'wins': 0, 'losses': 0, 'win_rate': 0, 'best': 0, 'worst': 0,
             'gross_wins': 0, 'gross_losses': 0, 'profit_factor': 0, 'max_drawdown': 0,
         }
-    wins = sum(1 for t in trade_history if t > 0)
-    losses = sum(1 for t in trade_history if t <= 0)
-    win_rate = (wins / len(trade_history) * 100) if trade_history else 0
-    best = max(trade_history)
-    worst = min(trade_history)
-    gross_wins = sum(t for t in trade_history if t > 0)
-    gross_losses = abs(sum(t for t in trade_history if t < 0))
-    profit_factor = (gross_wins / gross_losses) if gross_losses > 0 else gross_wins
-    # Max drawdown
-    max_dd = 0.0
-    peak = 0.0
-    cumul = 0.0
-    for t in trade_history:
-        cumul += t
-        if cumul > peak:
-            peak = cumul
-        dd = peak - cumul
-        if dd > max_dd:
-            max_dd = dd
+    th = trade_history
+    if not isinstance(th, TradeHistory):
+        # One exactly sized buffer; extend() computes the stats with array ops
+        th = TradeHistory(th, capacity=len(th))
     return {
-        'wins': wins, 'losses': losses, 'win_rate': win_rate,
-        'best': best, 'worst': worst,
-        'gross_wins': gross_wins, 'gross_losses': gross_losses,
-        'profit_factor': profit_factor, 'max_drawdown': max_dd,
+        'wins': th.wins, 'losses': th.losses, 'win_rate': th.win_rate,
+        'best': th.best, 'worst': th.worst,
+        'gross_wins': th.gross_wins, 'gross_losses': th.gross_losses,
+        'profit_factor': th.profit_factor, 'max_drawdown': th.max_drawdown,
     }
 
 
 def print_session_summary(duration_min, trade_count, session_pnl, trade_history):
-    """Print formatted session summary to terminal."""
+    """Print formatted session summary to terminal (one write)."""
     stats = calculate_session_stats(trade_history)
-    print()
-    print(f" {C}{B}{'═' * 45}{X}")
-    print(f" {C}{B} SESSION SUMMARY{X}")
-    print(f" {D}{'─' * 45}{X}")
-    print(f"  Duration:       {duration_min:.0f} min")
-    print(f"  Total Trades:   {trade_count}")
+    lines = [
+        "",
+        f" {C}{B}{'═' * 45}{X}",
+        f" {C}{B} SESSION SUMMARY{X}",
+        f" {D}{'─' * 45}{X}",
+        f"  Duration:       {duration_min:.0f} min",
+        f"  Total Trades:   {trade_count}",
+    ]
     if trade_history:
         wr_color = G if stats['win_rate'] >= 50 else R
-        print(f"  Win Rate:       {wr_color}{stats['win_rate']:.0f}%{X} ({G}{stats['wins']}W{X} / {R}{stats['losses']}L{X})")
         pnl_c = G if session_pnl >= 0 else R
-        print(f"  Total P&L:      {pnl_c}{'+' if session_pnl >= 0 else ''}${session_pnl:.2f}{X}")
-        print(f"  Best Trade:     {G}+${stats['best']:.2f}{X}")
-        print(f"  Worst Trade:    {R}${stats['worst']:.2f}{X}")
-        print(f"  Profit Factor:  {W}{stats['profit_factor']:.2f}{X}")
-        print(f"  Max Drawdown:   {R}-${stats['max_drawdown']:.2f}{X}")
+        lines += [
+            f"  Win Rate:       {wr_color}{stats['win_rate']:.0f}%{X} ({G}{stats['wins']}W{X} / {R}{stats['losses']}L{X})",
+            f"  Total P&L:      {pnl_c}${session_pnl:+.2f}{X}",
+            f"  Best Trade:     {G}+${stats['best']:.2f}{X}",
+            f"  Worst Trade:    {R}${stats['worst']:.2f}{X}",
+            f"  Profit Factor:  {W}{stats['profit_factor']:.2f}{X}",
+            f"  Max Drawdown:   {R}-${stats['max_drawdown']:.2f}{X}",
+        ]
     else:
-        print(f"  {D}No trades this session{X}")
-    print(f" {C}{B}{'═' * 45}{X}")
-    print()
+        lines.append(f"  {D}No trades this session{X}")
+    lines += [f" {C}{B}{'═' * 45}{X}", ""]
+    print("\n".join(lines))
     return stats
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import os
 
+import numpy as np
+
 from colors import G, R, Y, D, M
+from jit import njit
 
 # Signal weights
 W_MOMENTUM = float(os.getenv('W_MOMENTUM', '0.30'))
@@ -13,6 +16,8 @@ W_SR = float(os.getenv('W_SUPPORT_RESISTANCE', '0.10'))
 W_MACD = float(os.getenv('W_MACD', '0.15'))
 W_VWAP = float(os.getenv('W_VWAP', '0.15'))
 W_BB = float(os.getenv('W_BOLLINGER', '0.10'))
+# Same order as the components in _score()
+SIGNAL_WEIGHTS = np.array([W_MOMENTUM, W_DIVERGENCE, W_SR, W_MACD, W_VWAP, W_BB], dtype=np.float64)
 
 # Volatility
 VOL_THRESHOLD = float(os.getenv('VOL_THRESHOLD', '0.03'))
@@ -41,109 +46,176 @@ TP_MAX_PRICE = 0.95
 SL_DEFAULT = 0.06
 SL_MIN_PRICE = 0.03
 
+# Integer regime codes for the _score() kernel (unknown regimes map to RANGE: no adjustment)
+REGIME_RANGE, REGIME_CHOP, REGIME_TREND_UP, REGIME_TREND_DOWN = range(4)
+REGIME_CODES = {'RANGE': REGIME_RANGE, 'CHOP': REGIME_CHOP,
+                'TREND_UP': REGIME_TREND_UP, 'TREND_DOWN': REGIME_TREND_DOWN}
+DIRECTION_NAMES = {1: 'UP', -1: 'DOWN', 0: 'NEUTRAL'}
 
-def _ema(values, period):
-    """Compute simple EMA from a list of floats."""
-    if not values:
-        return 0.0
-    k = 2 / (period + 1)
-    ema = values[0]
-    for v in values[1:]:
-        ema = v * k + ema * (1 - k)
-    return ema
-
-
-def get_market_phase(time_remaining, window_min=15):
-    """Determine market phase based on time remaining.
-    Thresholds are proportional to window size.
-    Returns (phase_name, min_strength_threshold)."""
-    pct = time_remaining / window_min if window_min > 0 else 0
-    if pct > 0.66:
-        return 'EARLY', PHASE_EARLY_THRESHOLD
-    elif pct > 0.33:
-        return 'MID', PHASE_MID_THRESHOLD
-    elif pct > 0.06:
-        return 'LATE', PHASE_LATE_THRESHOLD
-    else:
-        return 'CLOSING', PHASE_CLOSING_THRESHOLD
+# Bucket scores indexed by how many thresholds a value has crossed (a sum of
+# int(comparison) terms instead of an if/elif cascade): RSI <25 / <35 / <45 / 45-55 /
+# >55 / >65 / >75, and S/R or Bollinger position low / lower / mid / upper / high
+_RSI_SCORES = np.array([1.0, 0.6, 0.2, 0.0, -0.2, -0.6, -1.0])
+_BAND_SCORES = np.array([0.8, 0.4, 0.0, -0.4, -0.8])
 
 
-def compute_signal(up_buy, down_buy, btc_price, binance, history, regime='RANGE', phase='MID'):
-    """Compute scalp signal v3 - Trend-Following with MACD, VWAP, Bollinger.
+class PriceHistory:
+    """Fixed-size ring of radar samples (ts, up, down, btc), stored column-wise.
 
-    Note: caller must append to history before calling this function.
+    Replaces a deque of per-cycle dicts: append writes four floats in place
+    and compute_signal reads whole columns as arrays. Each sample is written
+    twice (slot i and i + maxlen), so any window of the last n samples is one
+    contiguous slice even after the ring wraps.
     """
-    if up_buy <= 0 or btc_price <= 0 or not binance:
-        return None
 
-    score = 0.0
-    rsi = binance.get('rsi', 50)
-    bin_score = binance.get('score', 0)
+    FIELDS = {"ts": 0, "up": 1, "down": 2, "btc": 3}
+
+    def __init__(self, maxlen: int):
+        self._buf = np.zeros((len(self.FIELDS), 2 * maxlen), dtype=np.float64)
+        self._maxlen = maxlen
+        self._count = 0  # samples appended since the last clear()
+
+    def __len__(self) -> int:
+        return min(self._count, self._maxlen)
+
+    def append(self, ts: float, up: float, down: float, btc: float) -> None:
+        i = self._count % self._maxlen
+        self._buf[:, i] = self._buf[:, i + self._maxlen] = (ts, up, down, btc)
+        self._count += 1
+
+    def clear(self) -> None:
+        self._count = 0
+
+    def _end(self) -> int:
+        """Buffer index just past the newest sample (its window never starts below 0)."""
+        return (self._count - 1) % self._maxlen + self._maxlen + 1 if self._count else 0
+
+    def column(self, name: str, n: int | None = None) -> np.ndarray:
+        """Last n values (all if None) of one field, oldest first (always a view)."""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        end = self._end()
+        return self._buf[self.FIELDS[name], end - n:end]
+
+    def get(self, name: str, i: int) -> float:
+        """Value of one field for sample i (negative = from the newest)."""
+        size = len(self)
+        if not -size <= i < size:
+            raise IndexError("PriceHistory index out of range")
+        end = self._end()
+        return float(self._buf[self.FIELDS[name], end - size + i % size])
+
+
+# Explicit signatures: compiled when the module is imported, one array layout
+@njit('float64(float64[:], int64)', cache=True, fastmath=True)
+def _ema(values: np.ndarray, period: int) -> float:
+    """EMA of an array, seeded with its first positive value.
+    Non-positive entries (missing quotes) are skipped."""
+    k = 2 / (period + 1)
+    ema = 0.0
+    seeded = False
+    for i in range(values.shape[0]):
+        v = values[i]
+        if v <= 0:
+            continue
+        if seeded:
+            ema = v * k + ema * (1 - k)
+        else:
+            ema = v
+            seeded = True
+    return ema
 
-    # TREND FILTER (EMA of UP price)
-    trend_strength = 0.0
-    if len(history) >= 12:
-        up_prices = [h['up'] for h in list(history)[-20:] if h['up'] > 0]
-        if len(up_prices) >= 12:
-            fast_ema = _ema(up_prices, 5)
-            slow_ema = _ema(up_prices, 12)
-            ema_diff = (fast_ema - slow_ema) / slow_ema if slow_ema > 0 else 0
-            trend_strength = max(-1.0, min(1.0, ema_diff / 0.02))
 
+@njit('float64(float64[:])', cache=True, fastmath=True)
+def _trend_strength(up_prices: np.ndarray) -> float:
+    """Trend filter: EMA(5) vs EMA(12) of the UP price, scaled to [-1, 1].
+    0.0 with fewer than 12 positive samples."""
+    count = 0
+    for i in range(up_prices.shape[0]):
+        if up_prices[i] > 0:
+            count += 1
+    if count < 12:
+        return 0.0
+    fast_ema = _ema(up_prices, 5)
+    slow_ema = _ema(up_prices, 12)
+    if slow_ema <= 0:
+        return 0.0
+    return max(-1.0, min(1.0, (fast_ema - slow_ema) / slow_ema / 0.02))
+
+
+@njit('UniTuple(float64, 2)(float64[:], int64)', cache=True, fastmath=True)
+def _minmax_positive(values: np.ndarray, n: int) -> tuple:
+    """Min and max of the last n positive entries, in one backward pass.
+    (0.0, 0.0) when there are none."""
+    lo = hi = 0.0
+    seen = 0
+    for i in range(values.shape[0] - 1, -1, -1):
+        v = values[i]
+        if v <= 0:
+            continue
+        if seen == 0:
+            lo = hi = v
+        else:
+            lo = v if v < lo else lo
+            hi = v if v > hi else hi
+        seen += 1
+        if seen == n:
+            break
+    return lo, hi
+
+
+@njit('float64(float64[:], float64)', cache=True, fastmath=True)
+def _sr_raw(ups: np.ndarray, up_buy: float) -> float:
+    """Support/resistance score of up_buy within the recent UP range.
+    Non-positive entries (missing quotes) are skipped; 0.0 with fewer than
+    10 positive samples or a range of 3 cents or less."""
+    count = 0
+    for i in range(ups.shape[0]):
+        if ups[i] > 0:
+            count += 1
+    if count < 10:
+        return 0.0
+    up_min, up_max = _minmax_positive(ups, SR_LOOKBACK)
+    range_ = up_max - up_min
+    if range_ <= 0.03:
+        return 0.0
+    pos = (up_buy - up_min) / range_
+    return _BAND_SCORES[int(pos >= 0.20) + int(pos >= 0.35) + int(pos > 0.65) + int(pos > 0.80)]
+
+
+# No fastmath here: reassociating the weighted sum can move a score across the
+# strength/neutral-zone boundaries, which must match the pure-Python result.
+# The explicit signature compiles (or loads from cache) at import, not on the
+# first radar cycle.
+@njit('Tuple((float64, int64, int64, float64, float64, boolean))('
+      'float64, float64, float64, float64, float64, float64, float64, float64, float64, '
+      'float64, boolean, float64, float64, int64, float64[:], float64, float64, '
+      'float64, float64, float64)', cache=True)
+def _score(rsi: float, bin_score: float, div_score: float, sr_raw: float, trend_strength: float,
+           macd_hist: float, macd_hist_delta: float, vwap_pos: float, vwap_slope: float,
+           bb_pos: float, bb_squeeze: bool, atr: float, btc_price: float, regime_code: int,
+           weights: np.ndarray, vol_threshold: float, vol_amp: float,
+           chop_mult: float, trend_boost: float, counter_mult: float) -> tuple:
+    """Weighted signal score from scalar indicator inputs.
+
+    Returns (score, strength, direction_code, sr_adj, vol_pct, high_vol);
+    direction_code is 1 = UP, -1 = DOWN, 0 = NEUTRAL (see DIRECTION_NAMES).
+    """
     # 1. BTC MOMENTUM (30%) — RSI + candle score
-    if rsi < 25: rsi_c = 1.0
-    elif rsi < 35: rsi_c = 0.6
-    elif rsi < 45: rsi_c = 0.2
-    elif rsi > 75: rsi_c = -1.0
-    elif rsi > 65: rsi_c = -0.6
-    elif rsi > 55: rsi_c = -0.2
-    else: rsi_c = 0.0
-
-    momentum = rsi_c * 0.4 + min(max(bin_score / 0.5, -1), 1) * 0.6
-    score += momentum * W_MOMENTUM
-
-    # 2. DIVERGENCE (20%) — BTC vs Polymarket
-    div_score = 0.0
-    btc_var = 0
-    if len(history) >= DIVERGENCE_LOOKBACK:
-        h_old, h_new = history[-DIVERGENCE_LOOKBACK], history[-1]
-        if h_old['btc'] > 0 and h_old['up'] > 0:
-            btc_var = (h_new['btc'] - h_old['btc']) / h_old['btc'] * 100
-            poly_var = h_new['up'] - h_old['up']
-            if btc_var > 0.01 and poly_var < 0.02:
-                div_score = min(btc_var * 8, 1.0)
-            elif btc_var < -0.01 and poly_var > -0.02:
-                div_score = max(btc_var * 8, -1.0)
-    score += div_score * W_DIVERGENCE
+    rsi_c = _RSI_SCORES[int(rsi >= 25) + int(rsi >= 35) + int(rsi >= 45)
+                        + int(rsi > 55) + int(rsi > 65) + int(rsi > 75)]
 
-    # 3. SUPPORT/RESISTANCE (10%) + TREND FILTER
-    sr_score = 0.0
-    sr_raw = 0.0
-    if len(history) >= 10:
-        ups = [h['up'] for h in history if h['up'] > 0]
-        if len(ups) >= 10:
-            up_min, up_max = min(ups[-SR_LOOKBACK:]), max(ups[-SR_LOOKBACK:])
-            range_ = up_max - up_min
-            if range_ > 0.03:
-                pos = (up_buy - up_min) / range_
-                if pos < 0.20: sr_raw = 0.8
-                elif pos < 0.35: sr_raw = 0.4
-                elif pos > 0.80: sr_raw = -0.8
-                elif pos > 0.65: sr_raw = -0.4
+    momentum = rsi_c * 0.4 + min(max(bin_score / 0.5, -1.0), 1.0) * 0.6
+    # 2. DIVERGENCE (20%) — BTC vs Polymarket: div_score comes in ready-made
 
+    # 3. SUPPORT/RESISTANCE (10%) + TREND FILTER
+    sr_score = sr_raw
     if abs(trend_strength) > 0.3:
         if (trend_strength > 0 and sr_raw < 0) or (trend_strength < 0 and sr_raw > 0):
             reduction = min(abs(trend_strength) * 2, 1.0)
             sr_score = sr_raw * (1.0 - reduction)
-        else:
-            sr_score = sr_raw
-    else:
-        sr_score = sr_raw
-    score += sr_score * W_SR
 
     # 4. MACD HISTOGRAM DELTA (15%) — momentum acceleration
-    macd_hist = binance.get('macd_hist', 0)
-    macd_hist_delta = binance.get('macd_hist_delta', 0)
     macd_score = 0.0
     if abs(macd_hist_delta) > 0.5:
         # Strong acceleration
@@ -155,11 +227,8 @@ def compute_signal(up_buy, down_buy, btc_price, binance, history, regime='RANGE'
         macd_score = min(macd_score * 1.2, 1.0)
     elif macd_hist < 0 and macd_hist_delta < 0:
         macd_score = max(macd_score * 1.2, -1.0)
-    score += macd_score * W_MACD
 
     # 5. VWAP POSITION + SLOPE (15%)
-    vwap_pos = binance.get('vwap_pos', 0)
-    vwap_slope = binance.get('vwap_slope', 0)
     vwap_score = 0.0
     # Price vs VWAP
     if vwap_pos > 0.02:
@@ -172,48 +241,110 @@ def compute_signal(up_buy, down_buy, btc_price, binance, history, regime='RANGE'
     elif vwap_slope < -0.2:
         vwap_score -= 0.5
     vwap_score = max(-1.0, min(1.0, vwap_score))
-    score += vwap_score * W_VWAP
 
     # 6. BOLLINGER POSITION (10%)
-    bb_pos = binance.get('bb_pos', 0.5)
-    bb_squeeze = binance.get('bb_squeeze', False)
-    bb_score = 0.0
-    if bb_pos < 0.15:
-        bb_score = 0.8   # near lower band = oversold, likely UP
-    elif bb_pos < 0.30:
-        bb_score = 0.4
-    elif bb_pos > 0.85:
-        bb_score = -0.8  # near upper band = overbought, likely DOWN
-    elif bb_pos > 0.70:
-        bb_score = -0.4
+    # near lower band = oversold, likely UP; near upper band = overbought, likely DOWN
+    bb_score = _BAND_SCORES[int(bb_pos >= 0.15) + int(bb_pos >= 0.30)
+                            + int(bb_pos > 0.70) + int(bb_pos > 0.85)]
     # Squeeze amplifier: signal is stronger when breaking out of squeeze
     if bb_squeeze:
         bb_score *= 1.5
         bb_score = max(-1.0, min(1.0, bb_score))
-    score += bb_score * W_BB
+
+    # Weighted sum in one expression (same left-to-right order as before)
+    score = (momentum * weights[0] + div_score * weights[1] + sr_score * weights[2]
+             + macd_score * weights[3] + vwap_score * weights[4] + bb_score * weights[5])
 
     # VOLATILITY (amplifier)
-    atr = binance.get('atr', 0)
-    vol_pct = (atr / btc_price * 100) if btc_price > 0 else 0
-    high_vol = vol_pct > VOL_THRESHOLD
+    vol_pct = atr / btc_price * 100
+    high_vol = vol_pct > vol_threshold
     if high_vol:
-        score *= VOL_AMPLIFIER
+        score *= vol_amp
 
     # REGIME ADJUSTMENT
-    if regime == 'CHOP':
-        score *= REGIME_CHOP_MULT
-    elif regime in ('TREND_UP', 'TREND_DOWN'):
-        trend_dir = 1.0 if regime == 'TREND_UP' else -1.0
-        if (score > 0 and trend_dir > 0) or (score < 0 and trend_dir < 0):
-            score *= REGIME_TREND_BOOST
+    if regime_code == REGIME_CHOP:
+        score *= chop_mult
+    elif regime_code == REGIME_TREND_UP or regime_code == REGIME_TREND_DOWN:
+        if (score > 0 and regime_code == REGIME_TREND_UP) or (score < 0 and regime_code == REGIME_TREND_DOWN):
+            score *= trend_boost
         else:
-            score *= REGIME_COUNTER_MULT
+            score *= counter_mult
 
     score = max(-1.0, min(1.0, score))
-    if score > SIGNAL_NEUTRAL_ZONE: direction = 'UP'
-    elif score < -SIGNAL_NEUTRAL_ZONE: direction = 'DOWN'
-    else: direction = 'NEUTRAL'
+    if score > SIGNAL_NEUTRAL_ZONE: direction_code = 1
+    elif score < -SIGNAL_NEUTRAL_ZONE: direction_code = -1
+    else: direction_code = 0
     strength = int(abs(score) * 100)
+    return score, strength, direction_code, sr_score, vol_pct, high_vol
+
+
+def get_market_phase(time_remaining, window_min=15):
+    """Determine market phase based on time remaining.
+    Thresholds are proportional to window size.
+    Returns (phase_name, min_strength_threshold)."""
+    pct = time_remaining / window_min if window_min > 0 else 0
+    if pct > 0.66:
+        return 'EARLY', PHASE_EARLY_THRESHOLD
+    elif pct > 0.33:
+        return 'MID', PHASE_MID_THRESHOLD
+    elif pct > 0.06:
+        return 'LATE', PHASE_LATE_THRESHOLD
+    else:
+        return 'CLOSING', PHASE_CLOSING_THRESHOLD
+
+
+def compute_signal(up_buy, down_buy, btc_price, binance, history, regime='RANGE', phase='MID'):
+    """Compute scalp signal v3 - Trend-Following with MACD, VWAP, Bollinger.
+
+    Note: caller must append to history before calling this function.
+    """
+    if up_buy <= 0 or btc_price <= 0 or not binance:
+        return None
+
+    # Read every indicator once, up front
+    get = binance.get
+    rsi = get('rsi', 50)
+    bin_score = get('score', 0)
+    macd_hist = get('macd_hist', 0)
+    macd_hist_delta = get('macd_hist_delta', 0)
+    vwap_pos = get('vwap_pos', 0)
+    vwap_slope = get('vwap_slope', 0)
+    bb_pos = get('bb_pos', 0.5)
+    bb_squeeze = get('bb_squeeze', False)
+    atr = get('atr', 0)
+    n_hist = len(history)
+
+    # TREND FILTER (EMA of UP price)
+    trend_strength = 0.0
+    if n_hist >= 12:
+        trend_strength = _trend_strength(history.column('up', 20))
+
+    # DIVERGENCE inputs — BTC vs Polymarket over the last few samples
+    div_score = 0.0
+    btc_var = 0
+    if n_hist >= DIVERGENCE_LOOKBACK:
+        old_btc, old_up = history.get('btc', -DIVERGENCE_LOOKBACK), history.get('up', -DIVERGENCE_LOOKBACK)
+        if old_btc > 0 and old_up > 0:
+            btc_var = (history.get('btc', -1) - old_btc) / old_btc * 100
+            poly_var = history.get('up', -1) - old_up
+            if btc_var > 0.01 and poly_var < 0.02:
+                div_score = min(btc_var * 8, 1.0)
+            elif btc_var < -0.01 and poly_var > -0.02:
+                div_score = max(btc_var * 8, -1.0)
+
+    # SUPPORT/RESISTANCE position of up_buy in the recent range
+    sr_raw = 0.0
+    if n_hist >= 10:
+        sr_raw = _sr_raw(history.column('up'), float(up_buy))
+
+    # Inputs are cast so every call hits the same compiled signature
+    score, strength, direction_code, sr_score, vol_pct, high_vol = _score(
+        float(rsi), float(bin_score), float(div_score), sr_raw, trend_strength,
+        float(macd_hist), float(macd_hist_delta), float(vwap_pos), float(vwap_slope),
+        float(bb_pos), bool(bb_squeeze), float(atr), float(btc_price),
+        REGIME_CODES.get(regime, REGIME_RANGE), SIGNAL_WEIGHTS, VOL_THRESHOLD, VOL_AMPLIFIER,
+        REGIME_CHOP_MULT, REGIME_TREND_BOOST, REGIME_COUNTER_MULT)
+    direction = DIRECTION_NAMES[direction_code]
 
     suggestion = None
     if strength >= 30:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import sys
 import time
 import logging
-from datetime import datetime
+from concurrent.futures import Future, wait as wait_futures
 
 from py_clob_client.clob_types import (
     OrderArgs, PartialCreateOrderOptions, OrderType,
@@ -13,8 +13,9 @@ from py_clob_client.clob_types import (
 )
 
 from colors import G, R, Y, M, B, D, X
-from input_handler import read_key_nb
-from polymarket_api import get_token_position, monitor_order
+from input_handler import WakeEvent, read_key_nb, sleep_with_key
+from polymarket_api import get_token_position, invalidate_positions, monitor_order
+from ui_panel import clock_str
 
 logger = logging.getLogger(__name__)
 
@@ -25,11 +26,28 @@ MIN_SHARES = 5                # Polymarket minimum order size
 MAX_TOKEN_PRICE = 0.99        # maximum price for buy orders
 MIN_TOKEN_PRICE = 0.01        # minimum price for sell orders
 
+# Buy price math runs in integer thousandths of a dollar (CLOB ticks are 0.01 or 0.001)
+PRICE_SCALE = 1000
+_BUY_OFFSET_UNITS = round(BUY_PRICE_OFFSET * PRICE_SCALE)
+_MAX_PRICE_UNITS = round(MAX_TOKEN_PRICE * PRICE_SCALE)
+
 # Order monitoring
 ORDER_MONITOR_TIMEOUT = 30    # seconds to wait for order fill
 ORDER_MONITOR_INTERVAL = 2    # seconds between order status checks
 CLOSE_MONITOR_TIMEOUT = 15    # seconds to wait for close order fill
 TP_SL_MONITOR_TIMEOUT = 600   # seconds before TP/SL monitoring times out
+TP_SL_POLL_INTERVAL = 0.1     # seconds between key checks / price reads in TP/SL monitoring
+TP_SL_DRAW_INTERVAL = 0.2     # minimum seconds between TP/SL progress bar redraws
+
+# TP/SL progress bars, indexed by position 0..10 (green = toward TP)
+TP_SL_BARS = tuple(f"{G}{'█' * i}{X}{R}{'█' * (10 - i)}{X}" for i in range(11))
+
+# Per-token order options. neg_risk is fixed per market; the tick size can
+# switch between 0.01 and 0.001 near the price extremes, so it is re-read
+# after TICK_SIZE_TTL seconds.
+TICK_SIZE_TTL = 60
+_tick_sizes = {}  # token_id -> (tick_size, fetched_at monotonic)
+_neg_risk = {}    # token_id -> bool
 
 
 def sync_positions(client, token_up, token_down, positions, get_price):
@@ -71,7 +89,7 @@ def sync_positions(client, token_up, token_down, positions, get_price):
                 'direction': direction,
                 'price': price,
                 'shares': diff,
-                'time': datetime.now().strftime("%H:%M:%S"),
+                'time': clock_str(),
                 'source': 'platform',
             })
             changes.append((direction, diff, price, 'added'))
@@ -96,7 +114,7 @@ def sync_positions(client, token_up, token_down, positions, get_price):
 
 
 def close_all_positions(positions, token_up, token_down, trade_logger, reason,
-                        session_pnl, trade_history, get_price):
+                        session_pnl, trade_history, get_price, executor=None, feed=None):
     """Close all positions and calculate P&L for each.
 
     Args:
@@ -105,35 +123,79 @@ def close_all_positions(positions, token_up, token_down, trade_logger, reason,
         trade_logger: RadarLogger instance
         reason: str — 'market_expired', 'emergency', 'exit', 'tp', 'sl', 'cancel'
         session_pnl: current cumulative P&L
-        trade_history: list of individual trade P&L values
+        trade_history: TradeHistory (or list) of individual trade P&L values
         get_price: callable(token_id, side) -> float
+        executor: optional ThreadPoolExecutor; with both sides held, the two
+            exit quotes are fetched on it concurrently
+        feed: optional live quote source (MarketWS); when it has every exit
+            quote they are plain lookups and the executor is skipped
 
     Returns:
-        (total_pnl, count, updated_session_pnl, pnl_list)
+        (total_pnl, count, updated_session_pnl, pnl_list, proceeds)
         pnl_list: list of (direction, shares, entry_price, exit_price, pnl) per position
+        proceeds: sum of exit_price * shares (USD returned by the closes)
     """
     total_pnl = 0.0
+    proceeds = 0.0
     count = 0
     pnl_list = []
 
-    for p in positions:
-        token_id = token_up if p['direction'] == 'up' else token_down
+    # One exit quote per token held, fetched before the P&L loop
+    token_ids = {token_up if p['direction'] == 'up' else token_down for p in positions}
+    live = feed is not None and all(feed.get_price(tid, "SELL") for tid in token_ids)
+    if executor is not None and len(token_ids) > 1 and not live:
+        futs = {tid: executor.submit(get_price, tid, "SELL") for tid in token_ids}
+    else:
+        futs = {}
+    quotes = {}
+    for tid in token_ids:
         try:
-            exit_price = get_price(token_id, "SELL")
+            quotes[tid] = futs[tid].result() if futs else get_price(tid, "SELL")
         except Exception as e:
             logger.debug("Error getting exit price: %s", e)
-            exit_price = 0
+            quotes[tid] = 0
+
+    for p in positions:
+        exit_price = quotes[token_up if p['direction'] == 'up' else token_down]
         pnl = (exit_price - p['price']) * p['shares'] if exit_price > 0 else 0
         total_pnl += pnl
         count += 1
         session_pnl += pnl
         trade_history.append(pnl)
         pnl_list.append((p['direction'], p['shares'], p['price'], exit_price, pnl))
+        amount = p['shares'] * exit_price
+        proceeds += amount
         trade_logger.log_trade("CLOSE", p['direction'], p['shares'], exit_price,
-                               p['shares'] * exit_price, reason, pnl, session_pnl)
+                               amount, reason, pnl, session_pnl)
 
     positions.clear()
-    return total_pnl, count, session_pnl, pnl_list
+    return total_pnl, count, session_pnl, pnl_list, proceeds
+
+
+def _order_options(client, token_id):
+    """PartialCreateOrderOptions for a token, from the per-token caches."""
+    now = time.monotonic()
+    hit = _tick_sizes.get(token_id)
+    if hit is None or now - hit[1] >= TICK_SIZE_TTL:
+        hit = _tick_sizes[token_id] = (client.get_tick_size(token_id), now)
+    neg_risk = _neg_risk.get(token_id)
+    if neg_risk is None:
+        neg_risk = _neg_risk[token_id] = client.get_neg_risk(token_id)
+    return PartialCreateOrderOptions(tick_size=hit[0], neg_risk=neg_risk)
+
+
+def _prefetch_options(client, token_id):
+    try:
+        _order_options(client, token_id)
+    except Exception as e:
+        logger.debug("Order options prefetch error for %s: %s", token_id[:8], e)
+
+
+def prefetch_order_options(client, executor, *token_ids):
+    """Fill the tick size / neg_risk caches for a market's tokens on the pool,
+    so the first order in that market does not wait for the lookups."""
+    for token_id in token_ids:
+        executor.submit(_prefetch_options, client, token_id)
 
 
 def execute_buy_market(client, direction, amount_usd, token_up, token_down,
@@ -145,19 +207,24 @@ def execute_buy_market(client, direction, amount_usd, token_up, token_down,
     if base_price <= 0:
         return None, f"{R}✗ Error getting price{X}"
 
-    price = min(base_price + BUY_PRICE_OFFSET, MAX_TOKEN_PRICE)
-    shares = round(amount_usd / price, 2)
+    # Integer units: the order price is an exact tick value (0.55 + 0.02 in
+    # floats is 0.5700000000000001) and shares round half-even to 0.01 like
+    # round(), but on the exact quotient
+    price_units = min(round(base_price * PRICE_SCALE) + _BUY_OFFSET_UNITS, _MAX_PRICE_UNITS)
+    price = price_units / PRICE_SCALE
+    hundredths, rem = divmod(round(amount_usd * 100) * PRICE_SCALE, price_units)
+    if 2 * rem > price_units or (2 * rem == price_units and hundredths % 2):
+        hundredths += 1
+    shares = hundredths / 100
     if shares < MIN_SHARES:
         return None, f"{R}✗ Minimum {MIN_SHARES} shares (increase amount){X}"
 
     try:
         # Run order creation with timeout to prevent hanging on API calls
         def _submit_order():
-            tick_size = client.get_tick_size(token_id)
-            neg_risk = client.get_neg_risk(token_id)
             order = client.create_order(
                 OrderArgs(token_id=token_id, price=price, size=shares, side="BUY"),
-                options=PartialCreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk),
+                options=_order_options(client, token_id),
             )
             return client.post_order(order, orderType=OrderType.GTC)
 
@@ -165,6 +232,8 @@ def execute_buy_market(client, direction, amount_usd, token_up, token_down,
         resp = fut.result(timeout=15)
     except Exception as e:
         return None, f"{R}✗ Error submitting: {e}{X}"
+    finally:
+        invalidate_positions(token_id)  # the order may have matched on arrival
 
     order_id = resp.get("orderID") or resp.get("id") if isinstance(resp, dict) else None
     if not order_id:
@@ -172,6 +241,7 @@ def execute_buy_market(client, direction, amount_usd, token_up, token_down,
 
     status, details = monitor_order(client, order_id, interval=ORDER_MONITOR_INTERVAL,
                                     timeout_sec=ORDER_MONITOR_TIMEOUT, quiet=quiet)
+    invalidate_positions(token_id)
 
     if status == "FILLED":
         sm = float(details.get("size_matched", 0)) if details else 0
@@ -182,59 +252,87 @@ def execute_buy_market(client, direction, amount_usd, token_up, token_down,
 
 
 def execute_close_market(client, token_up, token_down, get_price, executor):
-    """Close all positions."""
+    """Close all positions.
+
+    Each attempt reads both balances concurrently, then runs the per-token
+    preparation (allowance refresh, exit quote, tick size / neg_risk) for
+    every held token at once. The sell orders are posted one after the
+    other, and their fills are awaited only once both are posted."""
     results = []
     total_value = 0.0
 
     for _ in range(3):
-        shares_up = get_token_position(client, token_up)
-        shares_down = get_token_position(client, token_down)
+        fut_up = executor.submit(get_token_position, client, token_up)
+        fut_down = executor.submit(get_token_position, client, token_down)
+        shares_up, shares_down = fut_up.result(), fut_down.result()
 
         if shares_up < 0.01 and shares_down < 0.01:
             if results:
                 return f"{G}✓ CLOSED! {', '.join(results)} | Total: ${total_value:.2f}{X}"
             return f"{G}✓ No positions{X}"
 
-        for token_id, shares, name in [(token_up, shares_up, "UP"), (token_down, shares_down, "DOWN")]:
-            if shares < 0.01:
-                continue
-
-            base_price = get_price(token_id, "SELL")
-            market_price = max(base_price - SELL_PRICE_OFFSET, MIN_TOKEN_PRICE)
-
-            try:
-                fut_bal = executor.submit(
+        held = [(token_id, shares, name)
+                for token_id, shares, name in [(token_up, shares_up, "UP"), (token_down, shares_down, "DOWN")]
+                if shares >= 0.01]
+        prep = {}
+        for token_id, _, _ in held:
+            prep[token_id] = (
+                executor.submit(
                     client.update_balance_allowance,
                     params=BalanceAllowanceParams(
                         asset_type=AssetType.CONDITIONAL, token_id=token_id, signature_type=1,
                     )
-                )
+                ),
+                executor.submit(get_price, token_id, "SELL"),
+                executor.submit(_order_options, client, token_id),  # fills the per-token caches
+            )
+
+        posted = []  # (token_id, name, order_id, limit price)
+        for token_id, shares, name in held:
+            fut_bal, fut_quote, fut_opts = prep[token_id]
+            base_price = fut_quote.result()
+            market_price = max(base_price - SELL_PRICE_OFFSET, MIN_TOKEN_PRICE)
+
+            try:
                 fut_bal.result(timeout=10)
             except Exception as e:
                 logger.debug("update_balance_allowance error for %s: %s", name, e)
+            try:
+                fut_opts.result(timeout=10)
+            except Exception as e:
+                logger.debug("Order options error for %s: %s", name, e)  # retried by the sell below
 
             try:
                 def _submit_sell(tid=token_id, mp=market_price, sh=shares):
-                    tick_size = client.get_tick_size(tid)
-                    neg_risk = client.get_neg_risk(tid)
                     order = client.create_order(
                         OrderArgs(token_id=tid, price=mp, size=sh, side="SELL"),
-                        options=PartialCreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk),
+                        options=_order_options(client, tid),
                     )
                     return client.post_order(order, orderType=OrderType.GTC)
 
                 fut = executor.submit(_submit_sell)
-                resp = fut.result(timeout=15)
+                try:
+                    resp = fut.result(timeout=15)
+                finally:
+                    invalidate_positions(token_id)
                 order_id = resp.get("orderID") or resp.get("id") if isinstance(resp, dict) else None
                 if order_id:
-                    status, details = monitor_order(client, order_id, interval=1,
-                                                    timeout_sec=CLOSE_MONITOR_TIMEOUT, quiet=True)
-                    if status == "FILLED":
-                        sm = float(details.get("size_matched", 0)) if details else 0
-                        p = float(details.get("price", 0)) if details else market_price
-                        value = sm * p
-                        total_value += value
-                        results.append(f"{name}: {sm:.2f} @ ${p:.2f} = ${value:.2f}")
+                    posted.append((token_id, name, order_id, market_price))
+            except Exception as e:
+                logger.debug("Error closing %s position: %s", name, e)
+
+        # Both sells are on the book before either fill is awaited
+        for token_id, name, order_id, market_price in posted:
+            try:
+                status, details = monitor_order(client, order_id, interval=1,
+                                                timeout_sec=CLOSE_MONITOR_TIMEOUT, quiet=True)
+                invalidate_positions(token_id)
+                if status == "FILLED":
+                    sm = float(details.get("size_matched", 0)) if details else 0
+                    p = float(details.get("price", 0)) if details else market_price
+                    value = sm * p
+                    total_value += value
+                    results.append(f"{name}: {sm:.2f} @ ${p:.2f} = ${value:.2f}")
             except Exception as e:
                 logger.debug("Error closing %s position: %s", name, e)
 
@@ -244,47 +342,93 @@ def execute_close_market(client, token_up, token_down, get_price, executor):
 
 
 def monitor_tp_sl(token_id, tp, sl, tp_above, sl_above, get_price, executor,
-                  timeout_sec=TP_SL_MONITOR_TIMEOUT):
+                  timeout_sec=TP_SL_MONITOR_TIMEOUT, feed=None):
     """Monitor price until TP, SL, manual cancel (C key), or timeout.
-    Uses concurrent price fetch + key checking for lower latency."""
+    The price fetch runs on the executor while keys are checked every
+    TP_SL_POLL_INTERVAL; each quote is evaluated as soon as it arrives.
+    Between quotes the loop blocks in sleep_with_key(), so the C key ends the
+    wait at once. With a live `feed` (MarketWS) the same wait is also ended
+    by the token's update event (a WakeEvent, selected together with stdin),
+    so a new top of book is checked as soon as it is pushed, and the quote is
+    read inline (a dict lookup, not worth a pool hand-off).
+    The progress bar is redrawn at most every TP_SL_DRAW_INTERVAL."""
+    wake = None
+    if feed:
+        wake = feed.watch(token_id, WakeEvent())
+
+    def pause():
+        """Wait up to TP_SL_POLL_INTERVAL for a key or a book update; returns the key."""
+        key = sleep_with_key(TP_SL_POLL_INTERVAL, wake=wake)
+        if wake is not None:
+            wake.clear()
+        return key
+
+    # SL/TP never change during the monitor: only clock, price and bar vary
+    status_fmt = f"\r   {D}%s{X} | $%.2f | SL ${sl:.2f} [%s] TP ${tp:.2f} │ {D}C=close{X}   "
     price = 0.0
     start = time.time()
-    while True:
-        if time.time() - start > timeout_sec:
-            return 'TIMEOUT', price if price > 0 else get_price(token_id, "BUY")
-        # Fetch price concurrently while checking keys
-        fut_price = executor.submit(get_price, token_id, "BUY")
-
-        # Check keys while waiting for price (5 × 0.1s = 0.5s)
-        for _ in range(5):
-            key = read_key_nb()
+    last_draw = 0.0
+    last_line = None
+    fut_price = None
+    key = None
+    try:
+        while True:
+            if time.time() - start > timeout_sec:
+                if fut_price:
+                    fut_price.result()  # don't leak the future
+                return 'TIMEOUT', price if price > 0 else get_price(token_id, "BUY")
+            if fut_price is None:
+                if feed and feed.get_price(token_id, "BUY"):
+                    # Quote is in memory: read it here, as an already-resolved future
+                    fut_price = Future()
+                    fut_price.set_result(get_price(token_id, "BUY"))
+                else:
+                    fut_price = executor.submit(get_price, token_id, "BUY")
+
+            if key is None:
+                key = read_key_nb()
             if key == 'c':
                 fut_price.result()  # don't leak the future
                 return 'CANCEL', price if price > 0 else get_price(token_id, "BUY")
-            time.sleep(0.1)
-
-        price = fut_price.result()
-        if price <= 0:
-            continue
-
-        now = datetime.now().strftime("%H:%M:%S")
+            key = None
 
-        if tp_above and price >= tp:
-            return 'TP', price
-        if not tp_above and price <= tp:
-            return 'TP', price
-
-        if sl_above and price <= sl:
-            return 'SL', price
-        if not sl_above and price >= sl:
-            return 'SL', price
-
-        dist_tp = abs(tp - price)
-        dist_sl = abs(sl - price)
-        bar_pos = 10 - int(dist_tp / (dist_tp + dist_sl) * 10) if (dist_tp + dist_sl) > 0 else 5
-        bar = f"{G}{'█' * bar_pos}{X}{R}{'█' * (10 - bar_pos)}{X}"
-        sys.stdout.write(f"\r   {D}{now}{X} | ${price:.2f} | SL ${sl:.2f} [{bar}] TP ${tp:.2f} │ {D}C=close{X}   ")
-        sys.stdout.flush()
+            if not fut_price.done():
+                wait_futures((fut_price,), TP_SL_POLL_INTERVAL)  # returns as soon as the quote is in
+                continue
+            new_price = fut_price.result()
+            fut_price = None
+            if new_price <= 0:
+                key = pause()
+                continue
+            price = new_price
+
+            if tp_above and price >= tp:
+                return 'TP', price
+            if not tp_above and price <= tp:
+                return 'TP', price
+
+            if sl_above and price <= sl:
+                return 'SL', price
+            if not sl_above and price >= sl:
+                return 'SL', price
+
+            tick = time.monotonic()
+            if tick - last_draw >= TP_SL_DRAW_INTERVAL:
+                last_draw = tick
+                now = clock_str()
+                dist_tp = abs(tp - price)
+                dist_sl = abs(sl - price)
+                bar_pos = 10 - int(dist_tp / (dist_tp + dist_sl) * 10) if (dist_tp + dist_sl) > 0 else 5
+                line = status_fmt % (now, price, TP_SL_BARS[bar_pos])
+                if line != last_line:
+                    last_line = line
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
+            key = pause()
+    finally:
+        if feed:
+            feed.unwatch(token_id)
+            wake.close()
 
 
 def execute_hotkey(client, direction, trade_amount, token_up, token_down,
@@ -292,7 +436,7 @@ def execute_hotkey(client, direction, trade_amount, token_up, token_down,
     """Execute manual buy via hotkey (u/d). Returns (buy_info, error_msg)."""
     result, msg = execute_buy_market(client, direction, trade_amount, token_up, token_down,
                                      get_price, executor, quiet=True)
-    exec_time = datetime.now().strftime("%H:%M:%S")
+    exec_time = clock_str()
 
     if result:
         sys.stdout.write('\a')
@@ -317,17 +461,18 @@ def handle_buy(client, direction, trade_amount, token_up, token_down,
         reason: 'signal' or 'manual'
 
     Returns:
-        (info_dict_or_None, updated_balance, last_action_str)
+        (info_dict_or_None, updated_balance, last_action)
+        last_action: ('buy', ...) / ('buy_failed', ...) tuple, see ui_panel.ACTION_FMT
     """
     info, error_msg = execute_hotkey(client, direction, trade_amount, token_up, token_down,
                                      get_price, executor)
     if info:
         d_color = G if direction == 'up' else R
-        last_action = f"{d_color}{B}BUY {direction.upper()}{X} {info['shares']:.0f}sh @ ${info['price']:.2f} │ {D}{reason}{X}"
+        last_action = ('buy', d_color, direction.upper(), info['shares'], info['price'], reason)
         positions.append(info)
         balance -= info['price'] * info['shares']
         trade_logger.log_trade("BUY", direction, info['shares'], info['price'],
                                info['shares'] * info['price'], reason, 0, session_pnl)
     else:
-        last_action = f"{R}✗ BUY {direction.upper()} FAILED{X} │ {error_msg or 'unknown error'}"
+        last_action = ('buy_failed', direction.upper(), error_msg or 'unknown error')
     return info, balance, last_action
@@ -2,16 +2,137 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import sys
-import io
 import shutil
+import time
+
+try:
+    from signal import SIGWINCH, signal as set_signal_handler
+    HAS_SIGWINCH = True
+except ImportError:  # Windows
+    HAS_SIGWINCH = False
 
 from colors import G, R, Y, C, W, B, D, M, BL, X
 from signal_engine import detect_scenario
 
 PRICE_ALERT = float(os.getenv('PRICE_ALERT', '0.80'))
 HEADER_LINES = 15
+TERM_SIZE_POLL = 10  # redraws between width checks when SIGWINCH is not watched
+
+# Terminal width cache: None = query on the next redraw (set by the SIGWINCH handler)
+_term_w = None
+_term_w_age = 0
+_size_watched = False
+
+# Panel text (every line except the clock line) from the last redraw
+_last_body = None
+
+# clock_str() cache: the HH:MM:SS string of the last second formatted
+_clock_sec = None
+_clock_str = ""
+
+# ACTION line templates. Callers record the last action as a (kind, *values)
+# tuple and the panel formats it when drawn (plain strings are shown as-is).
+ACTION_FMT = {
+    'buy': f"{{}}{B}BUY {{}}{X} {{:.0f}}sh @ ${{:.2f}} │ {D}{{}}{X}",   # color, DIR, shares, price, reason
+    'buy_failed': f"{R}✗ BUY {{}} FAILED{X} │ {{}}",                   # DIR, error
+    'close': f"{{}}{B}{{}}{X} @ ${{:.2f}} │ {{}}P&L: ${{:+.2f}}{X}",   # exit color, reason, exit price, pnl color, pnl
+    'emergency': f"{R}{B}EMERGENCY CLOSE{X}",
+    'closed': f"{G}✓ CLOSED{X} │ {{}}P&L: ${{:+.2f}}{X}",              # pnl color, session pnl
+}
+_last_action = (None, "")  # (action, formatted) from the last redraw
+
+# Fixed panel/log fragments, built once at import instead of on every redraw
+DIRECTION_STYLE = {'UP': (G, '▲'), 'DOWN': (R, '▼')}  # signal direction -> (color, symbol)
+DIRECTION_STYLE_NEUTRAL = (D, '─')
+STRENGTH_BARS = tuple('█' * i + '░' * (10 - i) for i in range(11))  # indexed by strength // 10
+PANEL_REGIME = {'TREND_UP': f"{G}{B}TREND▲{X}", 'TREND_DOWN': f"{R}{B}TREND▼{X}", 'CHOP': f"{Y}{B}CHOP{X}"}
+PANEL_REGIME_DEFAULT = f"{D}RANGE{X}"
+PANEL_PHASE = {'EARLY': f"{C}EARLY{X}", 'MID': f"{G}MID{X}", 'LATE': f"{Y}{B}LATE{X}", 'CLOSING': f"{R}{B}CLOSING{X}"}
+PANEL_PHASE_DEFAULT = f"{D}─{X}"
+LOG_REGIME = {'TREND_UP': f"{G}T▲{X}", 'TREND_DOWN': f"{R}T▼{X}", 'CHOP': f"{Y}CH{X}"}
+LOG_REGIME_DEFAULT = f"{D}RG{X}"
+LOG_TREND_FLAT = f"{D}{'T: 0.0':<7s}{X}"
+LOG_SR_FLAT = f"{D}{'SR: 0.0':<13s}{X}"
+
+# Lines 12, 14 and 15 of the panel never change
+HOTKEYS_LINE = f"\033[12;1H\033[K {W}{B}U{X}{D}=buy UP{X} │ {W}{B}D{X}{D}=buy DOWN{X} │ {W}{B}C{X}{D}=close all{X} │ {W}{B}S{X}{D}=accept signal{X} │ {W}{B}Q{X}{D}=exit{X}"
+COLUMNS_LINE = f"\033[14;1H\033[K   {D}{'UP':>8s} {'DN':>8s} │ {'RSI':>7s} │ {'STRENGTH':>15s} │ {'VOL':4s} │ {'TREND':>7s} │ {'MACD':>6s} │ {'VWAP':>6s} │ {'BB':>6s} │ {'S/R':>13s} │ {'REGIME':6s}{X}"
+BLANK_LINE = "\033[15;1H\033[K"
+
+
+@functools.lru_cache(maxsize=4)
+def _rules(w: int) -> tuple:
+    """Separator lines 1, 3, 11 and 13 for a terminal width (recomputed only on resize)."""
+    return (f"\033[1;1H\033[K {C}{B}{'═' * (w - 2)}{X}",
+            f"\033[3;1H\033[K {C}{'═' * (w - 2)}{X}",
+            f"\033[11;1H\033[K {'─' * (w - 2)}",
+            f"\033[13;1H\033[K {C}{B}{'═' * (w - 2)}{X}")
+
+
+def format_action(action) -> str:
+    """Text for the ACTION line from a (kind, *values) tuple or a plain string.
+    The formatted text is reused while the action is unchanged."""
+    global _last_action
+    if not action or isinstance(action, str):
+        return action or ""
+    if action != _last_action[0]:
+        _last_action = (action, ACTION_FMT[action[0]].format(*action[1:]))
+    return _last_action[1]
+
+
+def _on_resize(signum, frame):
+    global _term_w
+    _term_w = None
+
+
+def watch_terminal_size() -> None:
+    """Refresh the cached panel width on SIGWINCH instead of polling it.
+    Must be called from the main thread; a no-op on Windows, where the
+    width is re-read every TERM_SIZE_POLL redraws instead."""
+    global _size_watched
+    if HAS_SIGWINCH:
+        set_signal_handler(SIGWINCH, _on_resize)
+        _size_watched = True
+
+
+def _terminal_width() -> int:
+    """Cached terminal width (one ioctl per resize, not per redraw)."""
+    global _term_w, _term_w_age
+    _term_w_age += 1
+    if _term_w is None or (not _size_watched and _term_w_age >= TERM_SIZE_POLL):
+        _term_w = shutil.get_terminal_size().columns
+        _term_w_age = 0
+    return _term_w
+
+
+def position_totals(positions) -> tuple:
+    """(up_shares, up_cost, down_shares, down_cost) of the open positions, in one pass."""
+    up_sh = up_cost = dn_sh = dn_cost = 0.0
+    for p in positions:
+        shares = p['shares']
+        if p['direction'] == 'up':
+            up_sh += shares
+            up_cost += shares * p['price']
+        else:
+            dn_sh += shares
+            dn_cost += shares * p['price']
+    return up_sh, up_cost, dn_sh, dn_cost
+
+
+def clock_str(ts: float | None = None) -> str:
+    """Local HH:MM:SS for a unix timestamp (default: now), without building a
+    datetime. The string is reused while the second is unchanged, so most
+    calls cost one integer compare."""
+    global _clock_sec, _clock_str
+    sec = int(time.time() if ts is None else ts)
+    if sec != _clock_sec:
+        t = time.localtime(sec)
+        _clock_str = f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        _clock_sec = sec
+    return _clock_str
 
 
 def draw_panel(time_str, balance, btc_price, bin_direction, confidence, binance_data,
@@ -22,20 +143,20 @@ def draw_panel(time_str, balance, btc_price, bin_direction, confidence, binance_
                trade_history=None, last_action="", asset_name="BTC",
                poly_latency_ms=0):
     """Redraws the static panel at the top (HEADER_LINES lines).
-    Uses StringIO buffer for single write+flush (reduces terminal I/O)."""
-    w = shutil.get_terminal_size().columns
-    buf = io.StringIO()
+    Fragments are collected in a list and joined for a single write+flush.
+    Only the clock line is rewritten when the rest of the panel is unchanged."""
+    global _last_body
+    rule_title, rule_top, rule_mid, rule_bottom = _rules(_terminal_width())
+    chunks = []  # panel body fragments, joined once at the end
 
-    buf.write("\033[s")  # save cursor
+    # Line 2: header with time and balance (always written)
+    clock_line = f"\033[2;1H\033[K {C}{B}RADAR POLYMARKET{X} │ {W}{time_str}{X} │ Balance: {G}${balance:.2f}{X} │ Trade: {W}${trade_amount:.0f}{X}"
 
     # Line 1: title bar
-    buf.write(f"\033[1;1H\033[K {C}{B}{'═' * (w - 2)}{X}")
-
-    # Line 2: header with time and balance
-    buf.write(f"\033[2;1H\033[K {C}{B}RADAR POLYMARKET{X} │ {W}{time_str}{X} │ Balance: {G}${balance:.2f}{X} │ Trade: {W}${trade_amount:.0f}{X}")
+    chunks.append(rule_title)
 
     # Line 3: separator
-    buf.write(f"\033[3;1H\033[K {C}{'═' * (w - 2)}{X}")
+    chunks.append(rule_top)
 
     # Line 4: Binance
     bin_color = G if bin_direction == 'UP' else R if bin_direction == 'DOWN' else D
@@ -43,93 +164,63 @@ def draw_panel(time_str, balance, btc_price, bin_direction, confidence, binance_
     score_bin = binance_data.get('score', 0)
     vol_str = f"{Y}HIGH{X}" if (signal and signal.get('high_vol')) else f"{D}normal{X}"
     # Regime indicator
-    if regime == 'TREND_UP':
-        reg_str = f"{G}{B}TREND▲{X}"
-    elif regime == 'TREND_DOWN':
-        reg_str = f"{R}{B}TREND▼{X}"
-    elif regime == 'CHOP':
-        reg_str = f"{Y}{B}CHOP{X}"
-    else:
-        reg_str = f"{D}RANGE{X}"
+    reg_str = PANEL_REGIME.get(regime, PANEL_REGIME_DEFAULT)
     if data_source == 'ws':
         src_str = f"{G}{B}WebSocket{X}"
     elif ws_status:
         src_str = f"{D}HTTP{X} {Y}{ws_status}{X}"
     else:
         src_str = f"{D}HTTP{X}"
-    buf.write(f"\033[4;1H\033[K {C}BINANCE {X}│ {asset_name}: {W}${btc_price:>8,.2f}{X} │ {bin_color}{B}{bin_direction}{X} (score:{score_bin:+.2f} conf:{confidence:.0f}%) │ RSI:{rsi_val:.0f} │ Vol:{vol_str} │ {reg_str} │ {src_str}")
+    chunks.append(f"\033[4;1H\033[K {C}BINANCE {X}│ {asset_name}: {W}${btc_price:>8,.2f}{X} │ {bin_color}{B}{bin_direction}{X} (score:{score_bin:+.2f} conf:{confidence:.0f}%) │ RSI:{rsi_val:.0f} │ Vol:{vol_str} │ {reg_str} │ {src_str}")
 
     # Line 5: Market
     time_color = R if time_remaining < 2 else Y if time_remaining < 5 else G
-    if phase == 'EARLY':
-        phase_str = f"{C}EARLY{X}"
-    elif phase == 'MID':
-        phase_str = f"{G}MID{X}"
-    elif phase == 'LATE':
-        phase_str = f"{Y}{B}LATE{X}"
-    elif phase == 'CLOSING':
-        phase_str = f"{R}{B}CLOSING{X}"
-    else:
-        phase_str = f"{D}─{X}"
+    phase_str = PANEL_PHASE.get(phase, PANEL_PHASE_DEFAULT)
     ptb_str = ""
     if price_to_beat > 0 and btc_price > 0:
         diff = btc_price - price_to_beat
         diff_color = G if diff >= 0 else R
         ptb_str = f" │ Beat: {W}${price_to_beat:,.2f}{X} ({diff_color}{diff:+,.2f}{X})"
     poly_lat_str = f" │ Poly:{Y}{poly_latency_ms:.0f}ms{X}" if poly_latency_ms > 0 else ""
-    buf.write(f"\033[5;1H\033[K {Y}MARKET  {X}│ {market_slug} │ Closes in: {time_color}{time_remaining:.1f}min{X} │ {phase_str}{ptb_str}{poly_lat_str}")
+    chunks.append(f"\033[5;1H\033[K {Y}MARKET  {X}│ {market_slug} │ Closes in: {time_color}{time_remaining:.1f}min{X} │ {phase_str}{ptb_str}{poly_lat_str}")
 
     # Line 6: Polymarket
-    buf.write(f"\033[6;1H\033[K {G}POLY    {X}│ {asset_name}: {W}${btc_price:>8,.2f}{X} │ UP: {G}${up_buy:.2f}{X}/{G}${1.0 - down_buy:.2f}{X} ({G}{up_buy * 100:.0f}%{X}) │ DOWN: {R}${down_buy:.2f}{X}/{R}${1.0 - up_buy:.2f}{X} ({R}{down_buy * 100:.0f}%{X})")
+    chunks.append(f"\033[6;1H\033[K {G}POLY    {X}│ {asset_name}: {W}${btc_price:>8,.2f}{X} │ UP: {G}${up_buy:.2f}{X}/{G}${1.0 - down_buy:.2f}{X} ({G}{up_buy * 100:.0f}%{X}) │ DOWN: {R}${down_buy:.2f}{X}/{R}${1.0 - up_buy:.2f}{X} ({R}{down_buy * 100:.0f}%{X})")
 
     # Line 7: Positions + Session P&L
     pnl_color = G if session_pnl >= 0 else R
-    th = trade_history or []
+    th = trade_history
     stats_str = ""
     if th:
-        wins = sum(1 for t in th if t > 0)
-        losses = len(th) - wins
-        wr = (wins / len(th) * 100) if th else 0
+        # TradeHistory keeps these as running totals, no rescan per redraw
+        wr = th.win_rate
         wr_color = G if wr >= 50 else R
-        gw = sum(t for t in th if t > 0)
-        gl = abs(sum(t for t in th if t < 0))
-        pf = (gw / gl) if gl > 0 else gw
-        stats_str = f" │ {wr_color}WR:{wr:.0f}%{X}({G}{wins}W{X}/{R}{losses}L{X}) │ {W}PF:{pf:.1f}{X}"
-    pnl_str = f"{pnl_color}{B}P&L: {'+' if session_pnl >= 0 else ''}${session_pnl:.2f}{X} {D}({trade_count} trades){X}{stats_str}"
+        stats_str = f" │ {wr_color}WR:{wr:.0f}%{X}({G}{th.wins}W{X}/{R}{th.losses}L{X}) │ {W}PF:{th.profit_factor:.1f}{X}"
+    pnl_str = f"{pnl_color}{B}P&L: ${session_pnl:+.2f}{X} {D}({trade_count} trades){X}{stats_str}"
     if positions:
-        agg = {}
-        for p in positions:
-            d = p['direction']
-            if d not in agg:
-                agg[d] = {'shares': 0, 'cost': 0.0}
-            agg[d]['shares'] += p['shares']
-            agg[d]['cost'] += p['shares'] * p['price']
+        up_sh, up_cost, dn_sh, dn_cost = position_totals(positions)
         parts = []
-        for d in agg:
-            total_sh = agg[d]['shares']
-            avg_price = agg[d]['cost'] / total_sh if total_sh > 0 else 0
-            p_color = G if d == 'up' else R
-            parts.append(f"{p_color}{d.upper()} {total_sh:.0f}sh @ ${avg_price:.2f}{X}")
-        buf.write(f"\033[7;1H\033[K {M}POSITION{X}│ {' │ '.join(parts)} │ {pnl_str}")
+        if up_sh > 0:
+            parts.append(f"{G}UP {up_sh:.0f}sh @ ${up_cost / up_sh:.2f}{X}")
+        if dn_sh > 0:
+            parts.append(f"{R}DOWN {dn_sh:.0f}sh @ ${dn_cost / dn_sh:.2f}{X}")
+        chunks.append(f"\033[7;1H\033[K {M}POSITION{X}│ {' │ '.join(parts)} │ {pnl_str}")
     else:
-        buf.write(f"\033[7;1H\033[K {M}POSITION{X}│ {D}None{X} │ {pnl_str}")
+        chunks.append(f"\033[7;1H\033[K {M}POSITION{X}│ {D}None{X} │ {pnl_str}")
 
     # Line 8: Last action
     if last_action:
-        buf.write(f"\033[8;1H\033[K {W}ACTION  {X}│ {last_action}")
+        chunks.append(f"\033[8;1H\033[K {W}ACTION  {X}│ {format_action(last_action)}")
     else:
-        buf.write(f"\033[8;1H\033[K {D}ACTION  {X}│ {D}─{X}")
+        chunks.append(f"\033[8;1H\033[K {D}ACTION  {X}│ {D}─{X}")
 
     # Line 9: Signal
-    buf.write(f"\033[9;1H\033[K")
+    chunks.append(f"\033[9;1H\033[K")
     if signal:
         s_dir = signal['direction']
         strength = signal['strength']
-        blocks = strength // 10
-        bar_s = '█' * blocks + '░' * (10 - blocks)
-        if s_dir == 'UP': s_color, s_sym = G, '▲'
-        elif s_dir == 'DOWN': s_color, s_sym = R, '▼'
-        else: s_color, s_sym = D, '─'
+        bar_s = STRENGTH_BARS[strength // 10]
+        s_color, s_sym = DIRECTION_STYLE.get(s_dir, DIRECTION_STYLE_NEUTRAL)
         trend = signal.get('trend', 0)
         rsi_s = signal.get('rsi', 50)
         rsi_arrow = '↑' if rsi_s < 45 else '↓' if rsi_s > 55 else '─'
@@ -144,50 +235,54 @@ def draw_panel(time_str, balance, btc_price, bin_direction, confidence, binance_
         bb_p = signal.get('bb_pos', 0.5)
         bb_color = G if bb_p > 0.80 else R if bb_p < 0.20 else D
         bb_str = f"{bb_color}BB:{bb_p:.0%}{X}"
-        buf.write(f" {W}SIGNAL  {X}│ {s_color}{B}{s_sym} {s_dir:<7s} {strength:>3d}%{X} [{bar_s}] │ {rsi_color}RSI:{rsi_s:.0f}{rsi_arrow}{X} │ {t_str} │ {macd_str} │ {vwap_str} │ {bb_str}")
+        chunks.append(f" {W}SIGNAL  {X}│ {s_color}{B}{s_sym} {s_dir:<7s} {strength:>3d}%{X} [{bar_s}] │ {rsi_color}RSI:{rsi_s:.0f}{rsi_arrow}{X} │ {t_str} │ {macd_str} │ {vwap_str} │ {bb_str}")
     else:
-        buf.write(f" {W}SIGNAL  {X}│ {D}Waiting for data...{X}")
+        chunks.append(f" {W}SIGNAL  {X}│ {D}Waiting for data...{X}")
 
     # Line 10: Alert / Scenario
     scenario = detect_scenario(signal, regime, phase)
-    buf.write(f"\033[10;1H\033[K")
+    chunks.append(f"\033[10;1H\033[K")
     if status_msg:
-        buf.write(f" {Y}{B}STATUS  {X}│ {status_msg}")
+        chunks.append(f" {Y}{B}STATUS  {X}│ {status_msg}")
     elif alert_active:
         alert_color = G if alert_side == "UP" else R
         scenario_str = ""
         if scenario:
             sc_name, sc_color, sc_warn = scenario
             scenario_str = f" │ {sc_color}{BL}{B}{sc_name}{X}"
-        buf.write(f" {Y}{B}ALERT   {X}│ {alert_color}{B}{alert_side} @ ${alert_price:.2f}{X} (>= ${PRICE_ALERT:.2f}){scenario_str}")
+        chunks.append(f" {Y}{B}ALERT   {X}│ {alert_color}{B}{alert_side} @ ${alert_price:.2f}{X} (>= ${PRICE_ALERT:.2f}){scenario_str}")
     elif scenario:
         sc_name, sc_color, sc_warn = scenario
         if sc_warn:
-            buf.write(f" {Y}ALERT   {X}│ {sc_color}{BL}{B}⚠ {sc_name}{X}")
+            chunks.append(f" {Y}ALERT   {X}│ {sc_color}{BL}{B}⚠ {sc_name}{X}")
         else:
-            buf.write(f" {G}ALERT   {X}│ {sc_color}{BL}{B}● {sc_name}{X}")
+            chunks.append(f" {G}ALERT   {X}│ {sc_color}{BL}{B}● {sc_name}{X}")
     else:
-        buf.write(f" {D}ALERT   {X}│ {D}─{X}")
+        chunks.append(f" {D}ALERT   {X}│ {D}─{X}")
 
     # Line 11: separator
-    buf.write(f"\033[11;1H\033[K {'─' * (w - 2)}")
+    chunks.append(rule_mid)
 
     # Line 12: Hotkeys
-    buf.write(f"\033[12;1H\033[K {W}{B}U{X}{D}=buy UP{X} │ {W}{B}D{X}{D}=buy DOWN{X} │ {W}{B}C{X}{D}=close all{X} │ {W}{B}S{X}{D}=accept signal{X} │ {W}{B}Q{X}{D}=exit{X}")
+    chunks.append(HOTKEYS_LINE)
 
     # Line 13: bottom separator
-    buf.write(f"\033[13;1H\033[K {C}{B}{'═' * (w - 2)}{X}")
+    chunks.append(rule_bottom)
 
     # Line 14: column headers
-    buf.write(f"\033[14;1H\033[K   {D}{'UP':>8s} {'DN':>8s} │ {'RSI':>7s} │ {'STRENGTH':>15s} │ {'VOL':4s} │ {'TREND':>7s} │ {'MACD':>6s} │ {'VWAP':>6s} │ {'BB':>6s} │ {'S/R':>13s} │ {'REGIME':6s}{X}")
+    chunks.append(COLUMNS_LINE)
 
     # Line 15: blank
-    buf.write(f"\033[15;1H\033[K")
+    chunks.append(BLANK_LINE)
 
-    buf.write("\033[u")  # restore cursor
+    body = "".join(chunks)
+    if body == _last_body:
+        body = ""
+    else:
+        _last_body = body
 
-    # Single write + flush
-    sys.stdout.write(buf.getvalue())
+    # Single write + flush (save cursor, lines, restore cursor)
+    sys.stdout.write(f"\033[s{clock_line}{body}\033[u")
     sys.stdout.flush()
 
 
@@ -200,11 +295,8 @@ def format_scrolling_line(now_str, btc_price, up_buy, down_buy, signal, position
     sr_raw = signal.get('sr_raw', 0)
     sr_adj = signal.get('sr_adj', 0)
 
-    blocks = strength // 10
-    bar = '█' * blocks + '░' * (10 - blocks)
-    if s_dir == 'UP': color, sym = G, '▲'
-    elif s_dir == 'DOWN': color, sym = R, '▼'
-    else: color, sym = D, '─'
+    bar = STRENGTH_BARS[strength // 10]
+    color, sym = DIRECTION_STYLE.get(s_dir, DIRECTION_STYLE_NEUTRAL)
     rsi_arrow = '↑' if rsi_val < 45 else '↓' if rsi_val > 55 else '─'
 
     col_up     = f"UP:{G}${up_buy:.2f}{X}"
@@ -221,14 +313,14 @@ def format_scrolling_line(now_str, btc_price, up_buy, down_buy, signal, position
         t_text = f"T:{trend:+.1f}{t_sym}"
         col_trend = f"{t_color}{t_text:<7s}{X}"
     else:
-        col_trend = f"{D}{'T: 0.0':<7s}{X}"
+        col_trend = LOG_TREND_FLAT
 
     if sr_raw != 0:
         sr_text = f"SR:{sr_raw:+.1f}→{sr_adj:+.1f}"
         sr_color = G if sr_raw > 0 else R
         col_sr = f"{sr_color}{sr_text:<13s}{X}"
     else:
-        col_sr = f"{D}{'SR: 0.0':<13s}{X}"
+        col_sr = LOG_SR_FLAT
 
     # MACD column
     macd_h = signal.get('macd_hist', 0)
@@ -265,19 +357,11 @@ def format_scrolling_line(now_str, btc_price, up_buy, down_buy, signal, position
     # Position tag
     pos_str = ""
     if positions:
-        total_shares = sum(p['shares'] for p in positions)
-        dirs = set(p['direction'] for p in positions)
-        d_str = '/'.join(d.upper() for d in dirs)
-        pos_str = f" {M}{B}[{d_str} {total_shares:.0f}sh]{X}"
+        up_sh, _, dn_sh, _ = position_totals(positions)
+        d_str = 'UP/DOWN' if up_sh and dn_sh else 'UP' if up_sh else 'DOWN'
+        pos_str = f" {M}{B}[{d_str} {up_sh + dn_sh:.0f}sh]{X}"
 
     # Regime tag
-    if regime == 'TREND_UP':
-        col_regime = f"{G}T▲{X}"
-    elif regime == 'TREND_DOWN':
-        col_regime = f"{R}T▼{X}"
-    elif regime == 'CHOP':
-        col_regime = f"{Y}CH{X}"
-    else:
-        col_regime = f"{D}RG{X}"
+    col_regime = LOG_REGIME.get(regime, LOG_REGIME_DEFAULT)
 
     return f"   {col_up} {col_dn} │ {col_rsi} │ {col_signal} │ {col_vol} │ {col_trend} │ {col_macd} │ {col_vwap} │ {col_bb} │ {col_sr} │ {col_regime}{pos_str}"
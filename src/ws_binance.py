@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
-Binance WebSocket client for real-time BTC/USDT kline data.
-Maintains a candle buffer in memory with auto-reconnect.
+Binance WebSocket client for real-time BTC/USDT kline and trade data.
+Maintains a candle buffer in memory with auto-reconnect; trades keep the
+forming candle and the latest price current between kline updates.
 Falls back to HTTP polling if WebSocket is unavailable.
 """
 from __future__ import annotations
@@ -10,6 +11,7 @@ import json
 import logging
 import threading
 import time
+from collections import deque
 
 try:
     import websocket
@@ -17,7 +19,8 @@ try:
 except ImportError:
     HAS_WS = False
 
-from binance_api import get_klines
+from binance_api import Candles, get_klines
+from http_client import json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +29,23 @@ RECONNECT_DELAY_BASE = 2
 RECONNECT_DELAY_MAX = 30
 
 
+_INTERVAL_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+
 def _build_ws_endpoints(symbol="btcusdt", interval="1m"):
-    """Build WebSocket endpoint URLs for a given symbol."""
+    """Build combined-stream URLs (kline + aggTrade) for a given symbol."""
+    streams = f"{symbol}@kline_{interval}/{symbol}@aggTrade"
     return [
-        f"wss://stream.binance.com:9443/ws/{symbol}@kline_{interval}",
-        f"wss://stream.binance.com:443/ws/{symbol}@kline_{interval}",
+        f"wss://stream.binance.com:9443/stream?streams={streams}",
+        f"wss://stream.binance.com:443/stream?streams={streams}",
     ]
 
 
+def _interval_ms(interval):
+    """Kline interval string ("1m", "15m", "1h") in milliseconds."""
+    return int(interval[:-1]) * _INTERVAL_UNIT_MS[interval[-1]]
+
+
 class BinanceWS:
     """Real-time Binance kline WebSocket with auto-reconnect and HTTP fallback."""
 
@@ -42,8 +54,11 @@ class BinanceWS:
         self._interval = interval
         self._binance_symbol = symbol.upper()  # e.g. BTCUSDT for HTTP fallback
         self._ws_endpoints = _build_ws_endpoints(self._symbol, self._interval)
-        self._candles = []        # completed candles buffer
-        self._current = None      # candle still forming (live)
+        self._interval_ms = _interval_ms(interval)
+        self._candles = deque(maxlen=MAX_CANDLES)  # completed candle rows (ts, open, high, low, close, volume)
+        self._current = None      # row of the candle still forming (live), as a list
+        self._latest_price = 0.0  # last trade price
+        self._new_data = threading.Event()  # set on every kline/trade, cleared by get_candles()
         self._lock = threading.Lock()
         self._ws = None
         self._thread = None
@@ -64,6 +79,16 @@ class BinanceWS:
     def last_update(self):
         return self._last_update
 
+    @property
+    def latest_price(self):
+        """Last trade price from the stream (0.0 until the first trade/candle)."""
+        return self._latest_price
+
+    @property
+    def new_data(self) -> threading.Event:
+        """Set when the stream changed the candles since the last get_candles()."""
+        return self._new_data
+
     @property
     def status(self):
         """Diagnostic status string."""
@@ -106,49 +131,53 @@ class BinanceWS:
             except Exception as e:
                 logger.debug("WS close error: %s", e)
 
-    def get_candles(self, limit: int = 20) -> tuple[list[dict], str]:
+    def get_candles(self, limit: int = 20) -> tuple[Candles, str]:
         """Get candles from WS buffer. Falls back to HTTP if WS has no data.
 
         Returns:
-            candles: list of candle dicts
+            candles: Candles (column arrays)
             source: 'ws' or 'http'
         """
         with self._lock:
+            self._new_data.clear()
             # Include completed candles + current forming candle
             all_candles = list(self._candles)
             if self._current:
-                all_candles.append(self._current)
+                all_candles.append(tuple(self._current))  # snapshot: trades mutate it
 
         # Use WS data if connected and we have enough candles
         if self._connected and len(all_candles) >= 5 and (time.time() - self._last_update) < 10:
-            return all_candles[-limit:], 'ws'
+            return Candles.from_rows(all_candles[-limit:]), 'ws'
 
         # Fallback to HTTP
         try:
             candles = get_klines(symbol=self._binance_symbol, interval="1m", limit=limit)
+            rows = candles.rows()
             # Always refresh buffer with HTTP data (keeps buffer fresh for WS recovery)
             with self._lock:
-                self._candles = candles[:-1]  # all except last (still forming)
-                if candles:
-                    self._current = candles[-1]
+                self._candles = deque(rows[:-1], maxlen=MAX_CANDLES)  # all except last (still forming)
+                if rows:
+                    self._current = list(rows[-1])
+                    self._latest_price = self._current[4]
                 self._last_update = time.time()
             return candles, 'http'
         except Exception as e:
             logger.debug("WS HTTP fallback error: %s", e)
             # Return whatever we have
             if all_candles:
-                return all_candles[-limit:], 'ws'
-            return [], 'http'
+                return Candles.from_rows(all_candles[-limit:]), 'ws'
+            return Candles.from_rows([]), 'http'
 
     def _run_loop(self):
         """Main reconnection loop."""
         # Seed initial data via HTTP
         try:
-            candles = get_klines(symbol=self._binance_symbol, interval="1m", limit=MAX_CANDLES)
-            if candles:
+            rows = get_klines(symbol=self._binance_symbol, interval="1m", limit=MAX_CANDLES).rows()
+            if rows:
                 with self._lock:
-                    self._candles = candles[:-1]
-                    self._current = candles[-1]
+                    self._candles = deque(rows[:-1], maxlen=MAX_CANDLES)
+                    self._current = list(rows[-1])
+                    self._latest_price = self._current[4]
                     self._last_update = time.time()
         except Exception as e:
             logger.debug("WS initial seed error: %s", e)
@@ -203,38 +232,62 @@ class BinanceWS:
         self._last_error = str(error)[:100]
 
     def _on_message(self, ws, message):
-        """Process incoming kline message."""
+        """Process incoming combined-stream message (kline or aggTrade)."""
         try:
-            data = json.loads(message)
-            k = data.get("k")
-            if not k:
-                return
-
-            candle = {
-                "timestamp": k["t"],
-                "open": float(k["o"]),
-                "high": float(k["h"]),
-                "low": float(k["l"]),
-                "close": float(k["c"]),
-                "volume": float(k["v"]),
-            }
-
-            is_closed = k.get("x", False)
+            data = json_loads(message).get("data") or {}
+            event = data.get("e")
+            if event == "aggTrade":
+                self._on_trade(data)
+            elif event == "kline":
+                self._on_kline(data["k"])
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError) as e:
+            logger.debug("WS message parse error: %s", e)
 
-            with self._lock:
-                if is_closed:
-                    # Candle is complete — add to buffer
-                    self._candles.append(candle)
-                    # Trim buffer
-                    if len(self._candles) > MAX_CANDLES:
-                        self._candles = self._candles[-MAX_CANDLES:]
-                    self._current = None
-                else:
-                    # Candle still forming — update live candle
-                    self._current = candle
+    def _on_kline(self, k):
+        """Kline update: replace the forming candle, or close it into the buffer."""
+        candle = [
+            float(k["t"]),
+            float(k["o"]),
+            float(k["h"]),
+            float(k["l"]),
+            float(k["c"]),
+            float(k["v"]),
+        ]
 
-                self._last_update = time.time()
-                self._msg_count += 1
+        is_closed = k.get("x", False)
 
-        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
-            logger.debug("WS message parse error: %s", e)
+        with self._lock:
+            if is_closed:
+                # Candle is complete — add to buffer (deque trims to MAX_CANDLES)
+                self._candles.append(candle)
+                self._current = None
+            else:
+                # Candle still forming — update live candle
+                self._current = candle
+
+            self._latest_price = candle[4]
+            self._last_update = time.time()
+            self._msg_count += 1
+        self._new_data.set()
+
+    def _on_trade(self, t):
+        """Aggregated trade: fold price/qty into the forming candle until the next kline."""
+        price = float(t["p"])
+        qty = float(t["q"])
+        trade_ms = t["T"]
+
+        with self._lock:
+            self._latest_price = price
+            cur = self._current
+            # Trades past the forming candle's window wait for the next kline to open it
+            if cur is not None and trade_ms < cur[0] + self._interval_ms:
+                if price > cur[2]:
+                    cur[2] = price
+                elif price < cur[3]:
+                    cur[3] = price
+                cur[4] = price
+                cur[5] += qty
+
+            self._last_update = time.time()
+            self._msg_count += 1
+        self._new_data.set()
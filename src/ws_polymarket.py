@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Polymarket CLOB WebSocket clients.
+OrderWS (user channel) wakes order monitors as soon as one of their orders
+changes, so monitor_order() does not have to poll get_order() on a fixed
+interval; the REST order query stays authoritative, this feed only says
+"look now".
+MarketWS (market channel) keeps the best bid/ask of the current UP/DOWN
+tokens in memory, so quotes are a dict lookup instead of an HTTP call, and
+wakes TP/SL monitors when the top of book of their token moves.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+
+try:
+    import websocket
+    HAS_WS = True
+except ImportError:
+    HAS_WS = False
+
+from http_client import json_loads
+
+logger = logging.getLogger(__name__)
+
+WS_USER_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
+WS_MARKET_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+PING_INTERVAL = 10  # Polymarket drops connections without a text PING every ~10s
+RECONNECT_DELAY_BASE = 2
+RECONNECT_DELAY_MAX = 30
+# A connection that has sent nothing (not even the PONG to our PING) for this
+# long is treated as dead: MarketWS quotes fall back to HTTP and order monitors
+# back to REST polling. Per-token quote age is not used: a quiet book is still
+# a valid quote.
+FEED_STALE_SEC = PING_INTERVAL + 5
+
+
+class _ClobWS:
+    """Connection loop shared by the CLOB channels: reconnect with backoff
+    and text PING keepalive. Subclasses provide _subscription() and _handle()."""
+
+    url = ""
+    name = "CLOB WS"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ws = None
+        self._thread = None
+        self._running = False
+        self._connected = False
+        self._reconnect_count = 0
+        self._last_msg = 0.0  # time.monotonic() of the last message (incl. PONG)
+
+    @property
+    def is_connected(self):
+        return self._connected
+
+    @property
+    def is_live(self):
+        """Connected and heard from within FEED_STALE_SEC."""
+        return self._connected and time.monotonic() - self._last_msg <= FEED_STALE_SEC
+
+    def start(self) -> bool:
+        """Start the connection in a background thread."""
+        if not HAS_WS:
+            return False
+        if self._running:
+            return True
+        self._running = True
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop the connection."""
+        self._running = False
+        self._connected = False
+        if self._ws:
+            try:
+                self._ws.close()
+            except Exception as e:
+                logger.debug("%s close error: %s", self.name, e)
+
+    def _run_loop(self):
+        """Reconnection loop with exponential backoff."""
+        while self._running:
+            try:
+                self._ws = websocket.WebSocketApp(
+                    self.url,
+                    on_open=self._on_open,
+                    on_message=self._on_message,
+                    on_close=self._on_close,
+                    on_error=self._on_error,
+                )
+                self._ws.run_forever()
+            except Exception as e:
+                logger.debug("%s connect error: %s", self.name, e)
+
+            self._connected = False
+            if not self._running:
+                break
+
+            delay = min(RECONNECT_DELAY_BASE * (2 ** self._reconnect_count),
+                        RECONNECT_DELAY_MAX)
+            self._reconnect_count += 1
+            for _ in range(int(delay * 10)):
+                if not self._running:
+                    return
+                time.sleep(0.1)
+
+    def _ping_loop(self, ws):
+        """Send the text PING keepalive the CLOB WS expects."""
+        while self._running and self._connected and self._ws is ws:
+            time.sleep(PING_INTERVAL)
+            try:
+                ws.send("PING")
+            except Exception as e:
+                logger.debug("%s ping error: %s", self.name, e)
+                return
+
+    def _on_open(self, ws):
+        ws.send(json.dumps(self._subscription()))
+        self._last_msg = time.monotonic()
+        self._connected = True
+        self._reconnect_count = 0
+        threading.Thread(target=self._ping_loop, args=(ws,), daemon=True).start()
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self._connected = False
+
+    def _on_error(self, ws, error):
+        self._connected = False
+        logger.debug("%s error: %s", self.name, error)
+
+    def _on_message(self, ws, message):
+        self._last_msg = time.monotonic()
+        if message == "PONG":
+            return
+        try:
+            data = json_loads(message)
+            for msg in data if isinstance(data, list) else (data,):
+                self._handle(msg)
+        except (ValueError, AttributeError, TypeError, KeyError) as e:
+            logger.debug("%s message parse error: %s", self.name, e)
+
+    def _subscription(self) -> dict:
+        raise NotImplementedError
+
+    def _handle(self, msg: dict) -> None:
+        raise NotImplementedError
+
+
+class OrderWS(_ClobWS):
+    """User-channel WebSocket that signals per-order threading.Events on updates."""
+
+    url = WS_USER_URL
+    name = "Order WS"
+
+    def __init__(self, creds):
+        super().__init__()
+        self._creds = creds       # py_clob_client ApiCreds (api_key, api_secret, api_passphrase)
+        self._events = {}         # order_id -> threading.Event
+
+    def watch(self, order_id: str) -> None:
+        """Start tracking an order (call right after it is posted)."""
+        with self._lock:
+            self._events.setdefault(order_id, threading.Event())
+
+    def unwatch(self, order_id: str) -> None:
+        """Stop tracking an order."""
+        with self._lock:
+            self._events.pop(order_id, None)
+
+    def wait(self, order_id: str, timeout: float) -> bool:
+        """Block until the order gets an update or timeout elapses.
+        Returns True if an update arrived (the flag is then reset)."""
+        with self._lock:
+            event = self._events.setdefault(order_id, threading.Event())
+        if event.wait(timeout):
+            event.clear()
+            return True
+        return False
+
+    def _notify(self, order_id):
+        with self._lock:
+            event = self._events.get(order_id)
+        if event:
+            event.set()
+
+    def _subscription(self):
+        return {
+            "type": "user",
+            "markets": [],  # empty = every market of this account
+            "auth": {
+                "apiKey": self._creds.api_key,
+                "secret": self._creds.api_secret,
+                "passphrase": self._creds.api_passphrase,
+            },
+        }
+
+    def _handle(self, msg):
+        """Wake monitors for every order id mentioned in order/trade events."""
+        kind = msg.get("event_type")
+        if kind == "order":
+            self._notify(msg.get("id"))
+        elif kind == "trade":
+            self._notify(msg.get("taker_order_id"))
+            for maker in msg.get("maker_orders") or ():
+                self._notify(maker.get("order_id"))
+
+
+class MarketWS(_ClobWS):
+    """Market-channel WebSocket holding the order book tops of a set of tokens."""
+
+    url = WS_MARKET_URL
+    name = "Market WS"
+
+    def __init__(self, asset_ids=()):
+        super().__init__()
+        self._asset_ids = [a for a in asset_ids if a]
+        self._books = {}  # token_id -> ({price: size} bids, {price: size} asks)
+        self._best = {}   # token_id -> [best_bid, best_ask] (0.0 = empty side)
+        self._events = {}  # token_id -> threading.Event, set when its top of book changes
+
+    def get_price(self, token_id: str, side: str) -> float | None:
+        """Live quote with the same meaning as CLOB GET /price: BUY -> best bid,
+        SELL -> best ask. None when disconnected, silent for FEED_STALE_SEC
+        or the book is not known yet."""
+        if not self.is_live:
+            return None
+        best = self._best.get(token_id)
+        if not best:
+            return None
+        return best[0 if side == "BUY" else 1] or None
+
+    def watch(self, token_id: str, event=None):
+        """Start signalling top-of-book changes of a token (see wait()).
+        `event` replaces the internal threading.Event (anything with set(),
+        e.g. input_handler.WakeEvent); returns the event in use."""
+        with self._lock:
+            if event is not None:
+                self._events[token_id] = event
+                return event
+            return self._events.setdefault(token_id, threading.Event())
+
+    def unwatch(self, token_id: str) -> None:
+        """Stop signalling a token."""
+        with self._lock:
+            self._events.pop(token_id, None)
+
+    def wait(self, token_id: str, timeout: float) -> bool:
+        """Block until the token's best bid/ask changes or timeout elapses.
+        Returns True if it changed (the flag is then reset)."""
+        with self._lock:
+            event = self._events.setdefault(token_id, threading.Event())
+        if event.wait(timeout):
+            event.clear()
+            return True
+        return False
+
+    def resubscribe(self, asset_ids) -> None:
+        """Switch to a new set of tokens (market window changed).
+        Drops the connection; the run loop reconnects with the new list and
+        callers fall back to HTTP quotes until the new books arrive."""
+        asset_ids = [a for a in asset_ids if a]
+        if asset_ids == self._asset_ids:
+            return
+        with self._lock:
+            self._asset_ids = asset_ids
+            self._books.clear()
+            self._best.clear()
+        if self._ws:
+            try:
+                self._ws.close()
+            except Exception as e:
+                logger.debug("%s resubscribe error: %s", self.name, e)
+
+    def _subscription(self):
+        return {"type": "market", "assets_ids": self._asset_ids}
+
+    def _on_open(self, ws):
+        with self._lock:
+            self._books.clear()  # the server replays a full book per asset
+            self._best.clear()
+        super()._on_open(ws)
+
+    def _handle(self, msg):
+        kind = msg.get("event_type")
+        if kind == "book":
+            bids = {float(lvl["price"]): float(lvl["size"]) for lvl in msg.get("bids") or msg.get("buys") or ()}
+            asks = {float(lvl["price"]): float(lvl["size"]) for lvl in msg.get("asks") or msg.get("sells") or ()}
+            with self._lock:
+                if msg["asset_id"] in self._asset_ids:
+                    self._books[msg["asset_id"]] = (bids, asks)
+                    self._update_best(msg["asset_id"])
+        elif kind == "price_change":
+            # Current schema: price_changes[] with asset_id per entry;
+            # older one: a single asset_id with changes[]
+            changes = msg.get("price_changes")
+            if changes is None:
+                changes = [dict(c, asset_id=msg.get("asset_id")) for c in msg.get("changes") or ()]
+            with self._lock:
+                touched = set()
+                for change in changes:
+                    book = self._books.get(change["asset_id"])
+                    if book is None:
+                        continue  # no snapshot yet (or not subscribed)
+                    levels = book[0] if change["side"] == "BUY" else book[1]
+                    price, size = float(change["price"]), float(change["size"])
+                    if size > 0:
+                        levels[price] = size
+                    else:
+                        levels.pop(price, None)
+                    touched.add(change["asset_id"])
+                for asset_id in touched:
+                    self._update_best(asset_id)
+
+    def _update_best(self, asset_id):
+        """Recompute the top of book for one token (caller holds the lock)
+        and wake a waiter if it changed."""
+        bids, asks = self._books[asset_id]
+        best = [max(bids, default=0.0), min(asks, default=0.0)]
+        if best != self._best.get(asset_id):
+            self._best[asset_id] = best
+            event = self._events.get(asset_id)
+            if event:
+                event.set()